@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-import json
+import functools
 import time
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from pydantic import TypeAdapter, ValidationError
 
 from lintwise.core.exceptions import LLMResponseParseError
 from lintwise.core.logging import get_logger
@@ -13,17 +17,229 @@ from lintwise.core.models import (
     FileChange,
     PRDiff,
     ReviewComment,
+    Severity,
 )
 from lintwise.llm.base import LLMProvider
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
 logger = get_logger(__name__)
 
 
+def _findings_response_format(name: str, **extra_properties: dict[str, Any]) -> dict[str, Any]:
+    """Strict structured-output schema for a ``{"findings": [...]}`` reply."""
+    item_properties: dict[str, Any] = {
+        "title": {"type": "string"},
+        "body": {"type": "string"},
+        "line": {"type": ["integer", "null"]},
+        "severity": {"type": "string", "enum": [s.value for s in Severity]},
+        "confidence": {"type": "number"},
+        "suggestion": {"type": ["string", "null"]},
+        **extra_properties,
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "findings": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": item_properties,
+                            "required": list(item_properties),
+                            "additionalProperties": False,
+                        },
+                    },
+                },
+                "required": ["findings"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+# Structured-output schema for agent replies. With ``strict`` the provider
+# guarantees this exact shape, so no wrapper or type guessing is needed.
+FINDINGS_RESPONSE_FORMAT: dict[str, Any] = _findings_response_format("review_findings")
+
+# Multi-file variant: each finding also names its file by number in the prompt
+BATCH_FINDINGS_RESPONSE_FORMAT: dict[str, Any] = _findings_response_format(
+    "review_findings_batch", file_index={"type": "integer"}
+)
+
+# Validates a whole reply's findings in one call
+_COMMENTS_ADAPTER = TypeAdapter(list[ReviewComment])
+
+# Top-level keys the LLM may wrap its findings array in, in order of preference
+_FINDINGS_KEYS: tuple[str, ...] = ("findings", "issues", "comments")
+
+# Finding keys read from the LLM output, with the value used when a key is absent.
+# Everything else on ReviewComment is fixed per agent/file.
+_FINDING_DEFAULTS: dict[str, Any] = {
+    "line": None,
+    "severity": "suggestion",
+    "title": "Untitled finding",
+    "body": "",
+    "suggestion": None,
+    "confidence": 0.7,
+}
+
+# Per-PR context, sent as its own system message after the static prefix so
+# every file (and every agent) in a PR reuses the same text.
+_CONTEXT_PROMPT_TEMPLATE = """## PR Context
+- **Title**: {title}
+- **Description**: {description}"""
+
+# Per-file part of the user prompt; only these fields vary between calls.
+_FILE_PROMPT_TEMPLATE = """## File
+- **File**: `{filename}` ({language})
+- **Changes**: +{additions} / -{deletions}
+
+## Diff
+```{fence}
+{patch}
+```"""
+
+# Multi-file user prompt: a short instruction, then each file numbered from 1
+_BATCH_PROMPT_HEADER = """Review each of the {count} files below. Every finding must also include
+"file_index": the number of the file it refers to."""
+
+_BATCH_FILE_TEMPLATE = """## File {index}: `{filename}` ({language})
+- **Changes**: +{additions} / -{deletions}
+
+```{fence}
+{patch}
+```"""
+
+
+# Providers only cache prompt prefixes of at least this many tokens; the length
+# of the static prefix is checked by the agent tests, not at runtime
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Reviewer guidelines shared by every agent. Besides steering output quality,
+# they lift the static system prompt past PROMPT_CACHE_MIN_TOKENS so the
+# prefix is cached across every file and agent. Keep the text stable: any
+# edit invalidates the cached prefix.
+_REVIEW_GUIDELINES = """
+## Reviewer Guidelines
+
+### Reading the diff
+- Lines starting with "+" were added, lines starting with "-" were removed, and
+  lines starting with a space are unchanged context. Review the added lines; use
+  removed and context lines only to understand what changed.
+- A hunk shows only part of the file. Do not assume a variable is undefined, an
+  import is missing, or an error is unhandled just because the relevant code is
+  not visible; lower your confidence instead.
+- For renamed or moved code, focus on what differs from the original rather than
+  re-reviewing unchanged logic.
+- Generated files, lockfiles, and vendored code are out of scope unless the change
+  is clearly hand-written.
+
+### Severity levels
+- "critical": The change will cause incorrect behavior, data loss, a crash, or a
+  security vulnerability in normal use. Reserve this for issues that must be fixed
+  before merging, and explain the concrete failure scenario.
+- "warning": The change is likely to cause a bug under realistic conditions
+  (edge cases, error paths, concurrency, unexpected input) or introduces a
+  significant maintainability or performance risk.
+- "suggestion": The code works but could be clearer, simpler, faster, or more
+  idiomatic. The author may reasonably decline.
+- "nitpick": Purely stylistic or cosmetic points such as naming, formatting, or
+  wording. Use sparingly and never for anything that affects behavior.
+
+### Confidence calibration
+- 0.9-1.0: The problem is certain from the diff alone; you can point to the exact
+  line and describe the input that triggers it.
+- 0.7-0.9: The problem is very likely, but depends on context that is only partly
+  visible (for example how a function is called elsewhere).
+- 0.5-0.7: The problem is plausible and worth a second look by the author.
+- Below 0.5: Do not report the finding.
+
+### Line numbers
+- "line" refers to the line number in the NEW version of the file, as given by the
+  "+" side of the hunk headers (@@ -a,b +c,d @@).
+- Only reference lines that were added or modified in the diff. For findings about
+  removed code or the change as a whole, use null.
+- Count carefully from the hunk start; an off-by-one line number places the
+  comment on the wrong line of the pull request.
+
+### Writing findings
+- "title": at most 80 characters, written as a short statement of the problem
+  (e.g. "Unchecked None return from get_user"), not as a question.
+- "body": explain what is wrong, why it matters, and under which conditions it
+  fails. Use Markdown; wrap identifiers in backticks. Two to five sentences is
+  usually enough.
+- "suggestion": a minimal replacement for the affected lines, written in the same
+  language and style as the surrounding code, without diff markers. Use null when
+  no concise fix exists.
+- Report each distinct problem once. If the same mistake repeats, report the first
+  occurrence and mention the others in the body.
+- Do not comment on code outside the diff, on missing tests or documentation
+  unless the change clearly requires them, or on matters of personal taste.
+- Do not restate what the code does; every finding must identify a problem.
+- Prefer fewer, high-quality findings over many speculative ones.
+
+### Example response
+{"findings": [
+  {
+    "title": "Unchecked None return from get_user",
+    "body": "`get_user` returns `None` for unknown ids, so `user.email` raises `AttributeError`.",
+    "line": 42,
+    "severity": "warning",
+    "confidence": 0.85,
+    "suggestion": "user = get_user(user_id)\nif user is None:\n    raise NotFoundError(user_id)"
+  }
+]}
+
+When the diff has no issues in your area, respond with {"findings": []}.
+"""
+
+
+def _extract_findings(data: Any) -> list[Any]:
+    """Locate the findings list in a reply that is not ``{"findings": [...]}``.
+
+    Handles a bare array or an alternate wrapper key; anything else yields no findings.
+    """
+    if isinstance(data, dict):
+        return next((data[key] for key in _FINDINGS_KEYS if key in data), [])
+    if isinstance(data, list):
+        return data
+    return []
+
+
+@functools.cache
+def _system_prompt(category: str) -> str:
+    """Build the system prompt for a review category (computed once per category)."""
+    return (
+        f"You are an expert code reviewer specializing in {category} analysis. "
+        "Analyze the provided code diff and identify issues.\n\n"
+        'Respond ONLY with a JSON object of the form {"findings": [...]}. '
+        "Each finding must have:\n"
+        '- "title": Short descriptive title\n'
+        '- "body": Detailed explanation in Markdown\n'
+        '- "line": Line number in the new file (null if general)\n'
+        '- "severity": One of "critical", "warning", "suggestion", "nitpick"\n'
+        '- "confidence": Float 0.0-1.0\n'
+        '- "suggestion": Optional code fix suggestion (null if none)\n\n'
+        "Rules:\n"
+        "- ONLY flag issues visible in the diff, not imagined problems\n"
+        "- Be specific about WHY something is an issue\n"
+        "- Provide actionable suggestions when possible\n"
+        '- If no issues found, return an empty list: {"findings": []}\n'
+        f"{_REVIEW_GUIDELINES}"
+    )
+
+
 class ReviewAgent(ABC):
     """Abstract base for specialized code review agents.
 
     Each agent:
-    1. Builds a prompt from the file change + PR context
+    1. Builds a prompt from its static focus areas + the file change + PR context
     2. Sends it to the LLM
     3. Parses the structured JSON response into ReviewComment objects
     """
@@ -31,133 +247,256 @@ class ReviewAgent(ABC):
     name: str = "base_agent"
     category: str = "logic"  # Must match ReviewCategory values
 
+    @property
+    @abstractmethod
+    def focus_prompt(self) -> str:
+        """Static, per-agent instructions (task + focus areas).
+
+        Sent as its own user message so the prompt prefix is identical for
+        every file in a PR. Subclasses set it as a class attribute.
+        """
+
     def __init__(self, llm: LLMProvider) -> None:
         self._llm = llm
+        # Static leading messages, built once and shared by every file's request
+        self._prefix_messages: tuple[dict[str, str], ...] = (
+            {"role": "system", "content": self.get_system_prompt()},
+            {"role": "user", "content": self.focus_prompt},
+        )
+
+    def get_system_prompt(self) -> str:
+        """System message defining the agent's role and output format."""
+        return _system_prompt(self.category)
+
+    def build_context_prompt(self, context: PRDiff) -> str:
+        """Build the per-PR context message (title and description)."""
+        return _CONTEXT_PROMPT_TEMPLATE.format_map({
+            "title": context.title,
+            "description": context.description or "N/A",
+        })
 
-    @abstractmethod
     def build_prompt(self, file_change: FileChange, context: PRDiff) -> str:
-        """Build the analysis prompt for this agent's specialty.
+        """Build the per-file part of the analysis prompt.
 
         Args:
             file_change: The file diff to analyze.
-            context: Full PR context (title, description, other files).
+            context: Full PR context. Its title and description are sent
+                separately by ``build_context_prompt``.
 
         Returns:
-            Complete prompt string ready for the LLM.
+            Prompt string with the file details and the diff to review.
         """
-        ...
+        return _FILE_PROMPT_TEMPLATE.format_map({
+            "filename": file_change.filename,
+            "language": file_change.language or "unknown",
+            "fence": file_change.language or "diff",
+            "additions": file_change.additions,
+            "deletions": file_change.deletions,
+            "patch": file_change.patch,
+        })
 
-    def get_system_prompt(self) -> str:
-        """System message defining the agent's role and output format."""
-        return (
-            f"You are an expert code reviewer specializing in {self.category} analysis. "
-            "Analyze the provided code diff and identify issues.\n\n"
-            "Respond ONLY with a JSON array of findings. Each finding must have:\n"
-            '- "title": Short descriptive title\n'
-            '- "body": Detailed explanation in Markdown\n'
-            '- "line": Line number in the new file (null if general)\n'
-            '- "severity": One of "critical", "warning", "suggestion", "nitpick"\n'
-            '- "confidence": Float 0.0-1.0\n'
-            '- "suggestion": Optional code fix suggestion (null if none)\n\n'
-            "Rules:\n"
-            "- ONLY flag issues visible in the diff, not imagined problems\n"
-            "- Be specific about WHY something is an issue\n"
-            "- Provide actionable suggestions when possible\n"
-            "- If no issues found, return an empty array: []\n"
+    def build_messages(self, file_change: FileChange, context: PRDiff) -> list[dict[str, str]]:
+        """Build the chat messages for one file.
+
+        Messages run from most to least stable: the agent's system and focus
+        prompts (shared by every request), the PR context (shared by every
+        file in the PR), then the file's diff. Provider-side prompt caching
+        can therefore reuse everything before the diff.
+        """
+        return [
+            *self._prefix_messages,
+            {"role": "system", "content": self.build_context_prompt(context)},
+            {"role": "user", "content": self.build_prompt(file_change, context)},
+        ]
+
+    def build_batch_prompt(self, files: list[FileChange], context: PRDiff) -> str:
+        """Build the user prompt for several files, numbered from 1."""
+        sections = [_BATCH_PROMPT_HEADER.format(count=len(files))]
+        sections.extend(
+            _BATCH_FILE_TEMPLATE.format_map({
+                "index": index,
+                "filename": f.filename,
+                "language": f.language or "unknown",
+                "fence": f.language or "diff",
+                "additions": f.additions,
+                "deletions": f.deletions,
+                "patch": f.patch,
+            })
+            for index, f in enumerate(files, start=1)
         )
+        return "\n\n".join(sections)
+
+    def build_batch_messages(
+        self, files: list[FileChange], context: PRDiff
+    ) -> list[dict[str, str]]:
+        """Build the chat messages for a batch of files (one file uses ``build_messages``)."""
+        if len(files) == 1:
+            return self.build_messages(files[0], context)
+        return [
+            *self._prefix_messages,
+            {"role": "system", "content": self.build_context_prompt(context)},
+            {"role": "user", "content": self.build_batch_prompt(files, context)},
+        ]
 
     async def analyze(
-        self, file_change: FileChange, context: PRDiff
+        self,
+        file_change: FileChange,
+        context: PRDiff,
+        messages: list[dict[str, str]] | None = None,
     ) -> tuple[list[ReviewComment], AgentMetrics]:
         """Analyze a file change and return findings + metrics.
 
         This is the main entry point. It:
-        1. Builds the prompt
+        1. Builds the prompt (unless the caller passes the ``messages`` it
+           already built with ``build_messages``)
         2. Calls the LLM
         3. Parses the response
         4. Returns structured comments + telemetry
         """
-        start_ms = time.perf_counter_ns() // 1_000_000
+        return await self._run_analysis(
+            messages or self.build_messages(file_change, context),
+            FINDINGS_RESPONSE_FORMAT,
+            functools.partial(self._parse_response, filename=file_change.filename),
+            files_analyzed=1,
+            log=logger.bind(agent=self.name, file=file_change.filename),
+        )
 
-        try:
-            prompt = self.build_prompt(file_change, context)
-            response = await self._llm.complete(
-                messages=[
-                    {"role": "system", "content": self.get_system_prompt()},
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-            )
+    async def analyze_batch(
+        self,
+        files: list[FileChange],
+        context: PRDiff,
+        messages: list[dict[str, str]] | None = None,
+    ) -> tuple[list[ReviewComment], AgentMetrics]:
+        """Analyze several files in a single LLM request.
 
-            comments = self._parse_response(response.content, file_change.filename)
-            duration_ms = (time.perf_counter_ns() // 1_000_000) - start_ms
+        The files share one prompt and each finding names its file by number,
+        so a batch costs one round trip instead of one per file. Returns the
+        comments for all files together with a single metrics record.
+        ``messages`` may carry the caller's ``build_batch_messages`` output
+        for these files, so the prompt is not built twice.
+        """
+        if len(files) == 1:
+            return await self.analyze(files[0], context, messages)
+        return await self._run_analysis(
+            messages or self.build_batch_messages(files, context),
+            BATCH_FINDINGS_RESPONSE_FORMAT,
+            functools.partial(self._parse_batch_response, files=files),
+            files_analyzed=len(files),
+            log=logger.bind(agent=self.name, files=len(files)),
+        )
 
-            metrics = AgentMetrics(
-                agent_name=self.name,
-                duration_ms=duration_ms,
-                prompt_tokens=response.prompt_tokens,
-                completion_tokens=response.completion_tokens,
-                files_analyzed=1,
-                comments_produced=len(comments),
-            )
+    async def _run_analysis(
+        self,
+        messages: list[dict[str, str]],
+        response_format: dict[str, Any],
+        parse: Callable[[str], list[ReviewComment]],
+        files_analyzed: int,
+        log: Any,
+    ) -> tuple[list[ReviewComment], AgentMetrics]:
+        """Send one request and turn the reply into comments + metrics."""
+        start = time.perf_counter()
 
-            logger.info(
-                "agent_analysis_complete",
-                agent=self.name,
-                file=file_change.filename,
-                comments=len(comments),
-                duration_ms=duration_ms,
+        try:
+            # Requests from one agent share a prompt prefix; tag them alike so
+            # the provider routes them to the same prompt cache
+            response = await self._llm.complete(
+                messages=messages, response_format=response_format, user=self.name
             )
-
-            return comments, metrics
-
+            comments = parse(response.content)
         except Exception as e:
-            duration_ms = (time.perf_counter_ns() // 1_000_000) - start_ms
-            logger.error("agent_analysis_failed", agent=self.name, error=str(e))
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            log.error("agent_analysis_failed", error=str(e))
 
             metrics = AgentMetrics(
                 agent_name=self.name,
                 duration_ms=duration_ms,
-                files_analyzed=1,
+                files_analyzed=files_analyzed,
                 error=str(e),
             )
             return [], metrics
 
+        duration_ms = int((time.perf_counter() - start) * 1000)
+
+        metrics = AgentMetrics(
+            agent_name=self.name,
+            duration_ms=duration_ms,
+            prompt_tokens=response.prompt_tokens,
+            completion_tokens=response.completion_tokens,
+            files_analyzed=files_analyzed,
+            comments_produced=len(comments),
+        )
+
+        log.info(
+            "agent_analysis_complete",
+            comments=len(comments),
+            duration_ms=duration_ms,
+            cached_tokens=response.cached_tokens,
+        )
+
+        return comments, metrics
+
     def _parse_response(self, content: str, filename: str) -> list[ReviewComment]:
-        """Parse LLM JSON response into ReviewComment objects."""
+        """Parse LLM JSON response into ReviewComment objects.
+
+        Providers that do not enforce ``FINDINGS_RESPONSE_FORMAT`` may still
+        return a bare array or a differently named wrapper, so those are accepted.
+        """
+        return self._build_comments((filename, item) for item in self._load_findings(content))
+
+    def _parse_batch_response(self, content: str, files: list[FileChange]) -> list[ReviewComment]:
+        """Parse a multi-file reply, attributing each finding via its ``file_index``.
+
+        Findings whose index does not name one of ``files`` are skipped.
+        """
+        pairs: list[tuple[str, Any]] = []
+        for item in self._load_findings(content):
+            index = item.get("file_index") if isinstance(item, dict) else None
+            if type(index) is not int or not 1 <= index <= len(files):
+                logger.warning("skipping_unattributed_finding", agent=self.name, file_index=index)
+                continue
+            pairs.append((files[index - 1].filename, item))
+        return self._build_comments(pairs)
+
+    def _load_findings(self, content: str) -> list[Any]:
+        """Decode a reply and return its raw findings list."""
         try:
-            data = json.loads(content)
-        except json.JSONDecodeError as e:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
             raise LLMResponseParseError(f"Invalid JSON from {self.name}: {e}") from e
 
-        # Handle both {"findings": [...]} and bare [...]
-        if isinstance(data, dict):
-            findings = data.get("findings", data.get("issues", data.get("comments", [])))
-        elif isinstance(data, list):
-            findings = data
-        else:
-            return []
+        # Fast path: the schema-enforced {"findings": [...]} shape
+        if type(data) is dict and "findings" in data:
+            return data["findings"]
+        return _extract_findings(data)
 
-        comments: list[ReviewComment] = []
-        for item in findings:
+    def _build_comments(self, findings: Iterable[tuple[str, Any]]) -> list[ReviewComment]:
+        """Validate ``(filename, finding)`` pairs into comments, skipping malformed ones."""
+        fixed = {"category": self.category, "agent_name": self.name}
+
+        rows: list[dict[str, Any]] = []
+        for filename, item in findings:
             if not isinstance(item, dict):
+                logger.warning(
+                    "skipping_malformed_finding", agent=self.name, error="finding is not an object"
+                )
                 continue
+            fields = {key: item.get(key, default) for key, default in _FINDING_DEFAULTS.items()}
+            fields.update(fixed, file=filename)
+            rows.append(fields)
+
+        # Usually every finding is valid, so validate them all in one call and
+        # only fall back to per-item validation to skip the bad ones
+        try:
+            return _COMMENTS_ADAPTER.validate_python(rows)
+        except ValidationError:
+            pass
+
+        validate = ReviewComment.model_validate
+        comments: list[ReviewComment] = []
+        for fields in rows:
             try:
-                comments.append(
-                    ReviewComment(
-                        file=filename,
-                        line=item.get("line"),
-                        severity=item.get("severity", "suggestion"),
-                        category=self.category,
-                        title=item.get("title", "Untitled finding"),
-                        body=item.get("body", ""),
-                        suggestion=item.get("suggestion"),
-                        confidence=float(item.get("confidence", 0.7)),
-                        agent_name=self.name,
-                    )
-                )
-            except Exception as e:
+                comments.append(validate(fields))
+            except ValidationError as e:
                 logger.warning("skipping_malformed_finding", agent=self.name, error=str(e))
-                continue
 
         return comments
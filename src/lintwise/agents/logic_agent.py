@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from lintwise.agents.base import ReviewAgent
-from lintwise.core.models import FileChange, PRDiff
 
 
 class LogicAgent(ReviewAgent):
@@ -13,14 +12,7 @@ class LogicAgent(ReviewAgent):
     name = "logic_agent"
     category = "logic"
 
-    def build_prompt(self, file_change: FileChange, context: PRDiff) -> str:
-        return f"""Analyze this code diff for **logic and correctness issues**.
-
-## PR Context
-- **Title**: {context.title}
-- **Description**: {context.description or 'N/A'}
-- **File**: `{file_change.filename}` ({file_change.language or 'unknown'})
-- **Changes**: +{file_change.additions} / -{file_change.deletions}
+    focus_prompt = """Analyze this code diff for **logic and correctness issues**.
 
 ## Focus Areas
 - Null/None dereferences and missing null checks
@@ -32,9 +24,4 @@ class LogicAgent(ReviewAgent):
 - Variable shadowing or incorrect scope
 - Race conditions in concurrent code
 
-## Diff
-```{file_change.language or 'diff'}
-{file_change.patch}
-```
-
 Return your findings as a JSON object with a "findings" key containing an array."""
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from lintwise.agents.base import ReviewAgent
-from lintwise.core.models import FileChange, PRDiff
 
 
 class PerformanceAgent(ReviewAgent):
@@ -13,14 +12,7 @@ class PerformanceAgent(ReviewAgent):
     name = "performance_agent"
     category = "performance"
 
-    def build_prompt(self, file_change: FileChange, context: PRDiff) -> str:
-        return f"""Analyze this code diff for **performance issues**.
-
-## PR Context
-- **Title**: {context.title}
-- **Description**: {context.description or 'N/A'}
-- **File**: `{file_change.filename}` ({file_change.language or 'unknown'})
-- **Changes**: +{file_change.additions} / -{file_change.deletions}
+    focus_prompt = """Analyze this code diff for **performance issues**.
 
 ## Focus Areas
 - N+1 query patterns (database calls in loops)
@@ -33,9 +25,4 @@ class PerformanceAgent(ReviewAgent):
 - Inefficient string concatenation in loops
 - Missing pagination for large data sets
 
-## Diff
-```{file_change.language or 'diff'}
-{file_change.patch}
-```
-
 Return your findings as a JSON object with a "findings" key containing an array."""
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from lintwise.agents.base import ReviewAgent
-from lintwise.core.models import FileChange, PRDiff
 
 
 class ReadabilityAgent(ReviewAgent):
@@ -13,14 +12,7 @@ class ReadabilityAgent(ReviewAgent):
     name = "readability_agent"
     category = "readability"
 
-    def build_prompt(self, file_change: FileChange, context: PRDiff) -> str:
-        return f"""Analyze this code diff for **readability and style issues**.
-
-## PR Context
-- **Title**: {context.title}
-- **Description**: {context.description or 'N/A'}
-- **File**: `{file_change.filename}` ({file_change.language or 'unknown'})
-- **Changes**: +{file_change.additions} / -{file_change.deletions}
+    focus_prompt = """Analyze this code diff for **readability and style issues**.
 
 ## Focus Areas
 - Poor or misleading variable/function names
@@ -32,9 +24,4 @@ class ReadabilityAgent(ReviewAgent):
 - Inconsistent formatting or style
 - Functions doing too many things (SRP violations)
 
-## Diff
-```{file_change.language or 'diff'}
-{file_change.patch}
-```
-
 Return your findings as a JSON object with a "findings" key containing an array."""
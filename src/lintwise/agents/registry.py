@@ -17,6 +17,10 @@ AGENT_CLASSES: list[type[ReviewAgent]] = [
     SecurityAgent,
 ]
 
+# Name → class lookup, built once at import
+_AGENTS_BY_NAME: dict[str, type[ReviewAgent]] = {cls.name: cls for cls in AGENT_CLASSES}
+_AGENT_NAMES: tuple[str, ...] = tuple(_AGENTS_BY_NAME)
+
 
 def create_all_agents(llm: LLMProvider) -> list[ReviewAgent]:
     """Instantiate all registered agents with the given LLM provider."""
@@ -32,17 +36,17 @@ def create_agents_by_name(
     Args:
         llm: The LLM provider to inject.
         names: Optional list of agent names to include (e.g. ["logic_agent", "security_agent"]).
+            Unknown names are ignored and duplicates are collapsed.
 
     Returns:
-        List of instantiated agents.
+        List of instantiated agents, in the order requested.
     """
     if names is None:
         return create_all_agents(llm)
 
-    name_set = set(names)
-    return [cls(llm) for cls in AGENT_CLASSES if cls.name in name_set]
+    return [_AGENTS_BY_NAME[name](llm) for name in dict.fromkeys(names) if name in _AGENTS_BY_NAME]
 
 
 def get_agent_names() -> list[str]:
     """Get the names of all registered agents."""
-    return [cls.name for cls in AGENT_CLASSES]
+    return list(_AGENT_NAMES)
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from lintwise.agents.base import ReviewAgent
-from lintwise.core.models import FileChange, PRDiff
 
 
 class SecurityAgent(ReviewAgent):
@@ -13,14 +12,7 @@ class SecurityAgent(ReviewAgent):
     name = "security_agent"
     category = "security"
 
-    def build_prompt(self, file_change: FileChange, context: PRDiff) -> str:
-        return f"""Analyze this code diff for **security vulnerabilities**.
-
-## PR Context
-- **Title**: {context.title}
-- **Description**: {context.description or 'N/A'}
-- **File**: `{file_change.filename}` ({file_change.language or 'unknown'})
-- **Changes**: +{file_change.additions} / -{file_change.deletions}
+    focus_prompt = """Analyze this code diff for **security vulnerabilities**.
 
 ## Focus Areas
 - SQL injection (string interpolation in queries)
@@ -35,9 +27,4 @@ class SecurityAgent(ReviewAgent):
 - Missing authentication/authorization checks
 - Sensitive data exposure in logs or error messages
 
-## Diff
-```{file_change.language or 'diff'}
-{file_change.patch}
-```
-
 Return your findings as a JSON object with a "findings" key containing an array."""
@@ -3,17 +3,64 @@
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
+from pydantic import ValidationError
 
+from lintwise.api.dependencies import (
+    create_github_client,
+    create_rate_limiter,
+    get_app_settings,
+    get_llm_provider,
+)
 from lintwise.api.middleware import setup_exception_handlers, setup_middleware
 from lintwise.api.routers import health, reviews, webhooks
 from lintwise.core.logging import get_logger, setup_logging
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
 logger = get_logger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build shared services once at startup and release them on shutdown.
+
+    Without valid settings (e.g. missing tokens) the app still starts; the
+    review endpoints then answer 503 until configured.
+    """
+    try:
+        settings = get_app_settings()
+    except ValidationError as e:
+        logger.warning("services_not_configured", error_count=e.error_count())
+        yield
+        return
+
+    github_client = create_github_client(settings)
+    llm_provider = get_llm_provider()
+    # One limiter for all reviews, so concurrent reviews share the RPM/TPM budget
+    rate_limiter = create_rate_limiter(settings)
+    reviews.configure_review_router(
+        github_client,
+        llm_provider,
+        rate_limiter,
+        files_per_request=settings.files_per_request,
+        max_completion_tokens=settings.openai_max_tokens,
+    )
+    webhooks.configure_webhook_router(settings)
+    logger.info("services_configured", model=settings.openai_model)
+
+    try:
+        yield
+    finally:
+        await github_client.close()
+        await llm_provider.close()
+        get_llm_provider.cache_clear()
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application.
 
@@ -28,6 +75,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # Middleware
@@ -9,6 +9,7 @@ from lintwise.core.config import Settings, get_settings
 from lintwise.github.client import GitHubClient
 from lintwise.llm.base import LLMProvider
 from lintwise.llm.openai_provider import OpenAIProvider
+from lintwise.llm.rate_limiter import TokenBucketRateLimiter
 
 
 @functools.lru_cache
@@ -20,12 +21,26 @@ def get_app_settings() -> Settings:
 def create_github_client(settings: Settings | None = None) -> GitHubClient:
     """Create a GitHub API client from settings."""
     s = settings or get_app_settings()
-    return GitHubClient(
-        token=s.github_token.get_secret_value(),
-    )
+    return GitHubClient(s)
 
 
 def create_llm_provider(settings: Settings | None = None) -> LLMProvider:
     """Create an LLM provider from settings."""
     s = settings or get_app_settings()
     return OpenAIProvider(s)
+
+
+def create_rate_limiter(settings: Settings | None = None) -> TokenBucketRateLimiter:
+    """Create the LLM rate limiter from settings; share one per process."""
+    s = settings or get_app_settings()
+    return TokenBucketRateLimiter(
+        rpm=s.openai_rpm,
+        tpm=s.openai_tpm,
+        max_concurrent=s.max_concurrent_agents,
+    )
+
+
+@functools.lru_cache
+def get_llm_provider() -> LLMProvider:
+    """Process-wide LLM provider (singleton) so all requests share one connection pool."""
+    return create_llm_provider(get_app_settings())
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import secrets
 import time
-import uuid
+from typing import TYPE_CHECKING
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
 
 from lintwise.core.exceptions import (
     GitHubAuthError,
@@ -20,9 +22,52 @@ from lintwise.core.exceptions import (
 )
 from lintwise.core.logging import get_logger
 
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 logger = get_logger(__name__)
 
 
+class RequestLoggingMiddleware:
+    """Log every request with timing and a correlation ID.
+
+    Plain ASGI middleware: unlike ``@app.middleware("http")`` it needs no extra
+    task or Request/Response wrappers, only the scope and the response start.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = secrets.token_hex(4)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            logger.info(
+                "http_request",
+                method=scope["method"],
+                path=scope["path"],
+                status=status_code,
+                duration_ms=duration_ms,
+                request_id=request_id,
+            )
+
+
 def setup_middleware(app: FastAPI) -> None:
     """Attach all middleware to the FastAPI app."""
 
@@ -35,54 +80,33 @@ def setup_middleware(app: FastAPI) -> None:
         allow_headers=["*"],
     )
 
-    @app.middleware("http")
-    async def request_logging(request: Request, call_next):
-        """Log every request with timing and a correlation ID."""
-        request_id = str(uuid.uuid4())[:8]
-        start = time.perf_counter_ns()
-
-        response = await call_next(request)
-
-        duration_ms = (time.perf_counter_ns() - start) // 1_000_000
-        logger.info(
-            "http_request",
-            method=request.method,
-            path=str(request.url.path),
-            status=response.status_code,
-            duration_ms=duration_ms,
-            request_id=request_id,
-        )
-        response.headers["X-Request-ID"] = request_id
-        return response
-
+    # Added last so it wraps CORS and times the full request
+    app.add_middleware(RequestLoggingMiddleware)
 
-def setup_exception_handlers(app: FastAPI) -> None:
-    """Register domain exception → HTTP response mappings."""
 
-    @app.exception_handler(InvalidPRURLError)
-    async def handle_invalid_pr_url(request: Request, exc: InvalidPRURLError):
-        return JSONResponse(status_code=400, content={"error": "Invalid PR URL", "detail": str(exc)})
+# Domain exception → (HTTP status, error label). Handlers are resolved along the
+# exception's MRO, so the most specific registered type wins.
+EXCEPTION_RESPONSES: dict[type[LintwiseError], tuple[int, str]] = {
+    InvalidPRURLError: (400, "Invalid PR URL"),
+    ValidationError: (422, "Validation Error"),
+    GitHubAuthError: (401, "GitHub Auth Error"),
+    PRNotFoundError: (404, "PR Not Found"),
+    GitHubRateLimitError: (429, "Rate Limited"),
+    LLMError: (502, "LLM Error"),
+    LintwiseError: (500, "Internal Error"),
+}
 
-    @app.exception_handler(ValidationError)
-    async def handle_validation(request: Request, exc: ValidationError):
-        return JSONResponse(status_code=422, content={"error": "Validation Error", "detail": str(exc)})
 
-    @app.exception_handler(GitHubAuthError)
-    async def handle_auth(request: Request, exc: GitHubAuthError):
-        return JSONResponse(status_code=401, content={"error": "GitHub Auth Error", "detail": str(exc)})
+def _error_handler(status_code: int, error: str):
+    """Build an exception handler that renders a fixed status and error label."""
 
-    @app.exception_handler(PRNotFoundError)
-    async def handle_not_found(request: Request, exc: PRNotFoundError):
-        return JSONResponse(status_code=404, content={"error": "PR Not Found", "detail": str(exc)})
+    async def handler(request: Request, exc: Exception) -> JSONResponse:
+        return JSONResponse(status_code=status_code, content={"error": error, "detail": str(exc)})
 
-    @app.exception_handler(GitHubRateLimitError)
-    async def handle_rate_limit(request: Request, exc: GitHubRateLimitError):
-        return JSONResponse(status_code=429, content={"error": "Rate Limited", "detail": str(exc)})
+    return handler
 
-    @app.exception_handler(LLMError)
-    async def handle_llm(request: Request, exc: LLMError):
-        return JSONResponse(status_code=502, content={"error": "LLM Error", "detail": str(exc)})
 
-    @app.exception_handler(LintwiseError)
-    async def handle_lintwise(request: Request, exc: LintwiseError):
-        return JSONResponse(status_code=500, content={"error": "Internal Error", "detail": str(exc)})
+def setup_exception_handlers(app: FastAPI) -> None:
+    """Register domain exception → HTTP response mappings."""
+    for exc_type, (status_code, error) in EXCEPTION_RESPONSES.items():
+        app.add_exception_handler(exc_type, _error_handler(status_code, error))
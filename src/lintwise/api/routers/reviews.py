@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from fastapi import APIRouter, HTTPException
 
 from lintwise.api.schemas import (
@@ -11,12 +13,15 @@ from lintwise.api.schemas import (
     ReviewResponse,
 )
 from lintwise.core.logging import get_logger
-from lintwise.core.models import FileChange, FileStatus, PRDiff
+from lintwise.core.models import FileChange, FileStatus, PRDiff, ReviewComment
 from lintwise.github.client import GitHubClient, parse_pr_url
-from lintwise.github.diff_parser import parse_pr_files
-from lintwise.llm.base import LLMProvider
+from lintwise.github.diff_parser import count_marked_lines, parse_pr_files
 from lintwise.orchestrator.pipeline import run_review
 
+if TYPE_CHECKING:
+    from lintwise.llm.base import LLMProvider
+    from lintwise.llm.rate_limiter import TokenBucketRateLimiter
+
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
@@ -24,22 +29,41 @@ router = APIRouter(prefix="/reviews", tags=["Reviews"])
 # These will be injected at app startup
 _github_client: GitHubClient | None = None
 _llm_provider: LLMProvider | None = None
+_rate_limiter: TokenBucketRateLimiter | None = None
+_files_per_request: int = 1
+_max_completion_tokens: int = 4096
 
 
 def configure_review_router(
     github_client: GitHubClient,
     llm_provider: LLMProvider,
+    rate_limiter: TokenBucketRateLimiter,
+    files_per_request: int = 1,
+    max_completion_tokens: int = 4096,
 ) -> None:
     """Inject dependencies into the review router."""
-    global _github_client, _llm_provider
+    global _github_client, _llm_provider, _rate_limiter
+    global _files_per_request, _max_completion_tokens
     _github_client = github_client
     _llm_provider = llm_provider
+    _rate_limiter = rate_limiter
+    _files_per_request = files_per_request
+    _max_completion_tokens = max_completion_tokens
+
+
+def _count_changes(diff_text: str) -> tuple[int, int]:
+    """Count added and removed lines in a raw unified diff (excluding file headers)."""
+    return count_marked_lines(diff_text, "+"), count_marked_lines(diff_text, "-")
 
 
-def _to_api_comments(comments) -> list[ReviewCommentResponse]:
-    """Convert domain comments to API response format."""
+def _to_api_comments(comments: list[ReviewComment]) -> list[ReviewCommentResponse]:
+    """Convert domain comments to API response format.
+
+    Domain comments are already validated, so construction skips re-validation.
+    """
+    construct = ReviewCommentResponse.model_construct
     return [
-        ReviewCommentResponse(
+        construct(
             file=c.file,
             line=c.line,
             severity=c.severity.value,
@@ -73,7 +97,13 @@ async def create_review(request: ReviewRequest) -> ReviewResponse:
     pr_diff = await _github_client.get_pr_diff(owner, repo, pr_number)
 
     # Run the review pipeline
-    result = await run_review(pr_diff, _llm_provider)
+    result = await run_review(
+        pr_diff,
+        _llm_provider,
+        rate_limiter=_rate_limiter,
+        files_per_request=_files_per_request,
+        max_completion_tokens=_max_completion_tokens,
+    )
 
     return ReviewResponse(
         status="completed",
@@ -96,12 +126,13 @@ async def manual_review(request: ManualReviewRequest) -> ReviewResponse:
         raise HTTPException(status_code=503, detail="Service not configured")
 
     # Build a synthetic PRDiff from the raw text
+    additions, deletions = _count_changes(request.diff_text)
     file_change = FileChange(
         filename="manual_input.diff",
         status=FileStatus.MODIFIED,
         patch=request.diff_text,
-        additions=request.diff_text.count("\n+"),
-        deletions=request.diff_text.count("\n-"),
+        additions=additions,
+        deletions=deletions,
         language=None,
     )
 
@@ -114,7 +145,13 @@ async def manual_review(request: ManualReviewRequest) -> ReviewResponse:
         files=[file_change],
     )
 
-    result = await run_review(pr_diff, _llm_provider)
+    result = await run_review(
+        pr_diff,
+        _llm_provider,
+        rate_limiter=_rate_limiter,
+        files_per_request=_files_per_request,
+        max_completion_tokens=_max_completion_tokens,
+    )
 
     return ReviewResponse(
         status="completed",
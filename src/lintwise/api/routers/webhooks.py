@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import orjson
 from fastapi import APIRouter, HTTPException, Request
 
 from lintwise.api.schemas import ErrorResponse
@@ -13,13 +14,15 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
 
-_settings: Settings | None = None
+# Webhook secret as bytes, encoded once at startup; None disables verification
+_webhook_secret: bytes | None = None
 
 
 def configure_webhook_router(settings: Settings) -> None:
     """Inject settings dependency."""
-    global _settings
-    _settings = settings
+    global _webhook_secret
+    secret = settings.github_webhook_secret
+    _webhook_secret = secret.get_secret_value().encode("utf-8") if secret else None
 
 
 @router.post("/github", status_code=202)
@@ -33,23 +36,20 @@ async def github_webhook(request: Request):
     body = await request.body()
 
     # Verify webhook signature if secret is configured
-    if _settings and _settings.github_webhook_secret:
+    if _webhook_secret:
         signature = request.headers.get("X-Hub-Signature-256", "")
-        secret = _settings.github_webhook_secret.get_secret_value()
 
-        if not verify_signature(body, signature, secret):
+        if not verify_signature(body, signature, _webhook_secret):
             logger.warning("webhook_signature_invalid")
             raise HTTPException(status_code=401, detail="Invalid webhook signature")
 
     # Parse the event
     event_type = request.headers.get("X-GitHub-Event", "")
 
-    import json
-
     try:
-        payload = json.loads(body)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload") from None
 
     event = parse_webhook_event(event_type, payload)
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -28,12 +30,15 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4o"
     openai_temperature: float = 0.1
     openai_max_tokens: int = 4096
+    openai_rpm: int = 60
+    openai_tpm: int = 150_000
 
     # --- Agent Pipeline ---
     max_concurrent_agents: int = 4
     max_diff_lines: int = 5000
     review_timeout_seconds: int = 120
     max_files_per_review: int = 50
+    files_per_request: int = 4
 
     # --- Server ---
     host: str = "0.0.0.0"
@@ -42,6 +47,11 @@ class Settings(BaseSettings):
     debug: bool = False
 
 
+@functools.lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Factory that creates a cached Settings instance."""
+    """Factory that creates a cached Settings instance.
+
+    The environment is read and validated once per process; call
+    ``get_settings.cache_clear()`` to pick up changes.
+    """
     return Settings()  # type: ignore[call-arg]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+
 # ── Language Detection (extension → language name) ───────────────────────────
 
 EXTENSION_LANGUAGE_MAP: dict[str, str] = {
@@ -40,7 +42,7 @@ EXTENSION_LANGUAGE_MAP: dict[str, str] = {
 }
 
 # Files to skip during review (non-substantive changes)
-SKIP_PATTERNS: set[str] = {
+SKIP_PATTERNS: frozenset[str] = frozenset({
     "package-lock.json",
     "yarn.lock",
     "poetry.lock",
@@ -49,7 +51,7 @@ SKIP_PATTERNS: set[str] = {
     ".gitignore",
     ".gitattributes",
     "LICENSE",
-}
+})
 
 # Maximum tokens to allocate per agent per file analysis
 MAX_TOKENS_PER_ANALYSIS: int = 4000
@@ -71,9 +73,14 @@ RISK_THRESHOLDS: dict[str, int] = {
 }
 
 
+@functools.lru_cache(maxsize=1024)
 def detect_language(filename: str) -> str | None:
-    """Detect programming language from file extension."""
-    import os
+    """Detect programming language from file extension.
 
-    _, ext = os.path.splitext(filename.lower())
-    return EXTENSION_LANGUAGE_MAP.get(ext)
+    Filenames are ``/``-separated repo paths, as returned by GitHub.
+    """
+    basename = filename.rpartition("/")[2]
+    dot = basename.rfind(".")
+    if dot <= 0:  # No extension, or a dotfile such as .gitignore
+        return None
+    return EXTENSION_LANGUAGE_MAP.get(basename[dot:].lower())
@@ -4,40 +4,62 @@ from __future__ import annotations
 
 import logging
 import sys
+from typing import Any
 
+import orjson
 import structlog
 
 
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """JSONRenderer serializer backed by orjson (honours the renderer's ``default``)."""
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
+
+
 def setup_logging(level: str = "INFO") -> None:
-    """Configure structlog with JSON output for production, pretty for dev."""
+    """Configure structlog with JSON output for production, pretty for dev.
+
+    In production, structlog renders each event to bytes with orjson and writes
+    it to stdout itself, skipping the stdlib ``logging`` machinery. The stdlib
+    handler is still installed for third-party libraries and for debug mode.
+    """
+    level = level.upper()
+    is_debug = level == "DEBUG"
 
     shared_processors: list[structlog.types.Processor] = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.UnicodeDecoder(),
     ]
 
-    is_debug = level.upper() == "DEBUG"
-
     if is_debug:
         renderer: structlog.types.Processor = structlog.dev.ConsoleRenderer(colors=True)
+        structlog.configure(
+            processors=[
+                *shared_processors,
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            ],
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.stdlib.BoundLogger,
+            cache_logger_on_first_use=True,
+        )
     else:
-        renderer = structlog.processors.JSONRenderer()
-
-    structlog.configure(
-        processors=[
-            *shared_processors,
-            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
-        ],
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
-        cache_logger_on_first_use=True,
-    )
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+        structlog.configure(
+            processors=[
+                *shared_processors,
+                structlog.processors.JSONRenderer(serializer=orjson.dumps),
+            ],
+            logger_factory=structlog.BytesLoggerFactory(),
+            wrapper_class=structlog.make_filtering_bound_logger(level),
+            cache_logger_on_first_use=True,
+        )
 
+    # Stdlib records (third-party libraries, and structlog itself in debug mode)
     formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors,
         processors=[
             structlog.stdlib.ProcessorFormatter.remove_processors_meta,
             renderer,
@@ -50,13 +72,17 @@ def setup_logging(level: str = "INFO") -> None:
     root = logging.getLogger()
     root.handlers.clear()
     root.addHandler(handler)
-    root.setLevel(level.upper())
+    root.setLevel(level)
 
     # Silence noisy third-party loggers
     for name in ("httpx", "httpcore", "openai", "uvicorn.access"):
         logging.getLogger(name).setLevel(logging.WARNING)
 
 
-def get_logger(name: str) -> structlog.stdlib.BoundLogger:
-    """Get a bound logger for a module."""
+def get_logger(name: str) -> structlog.typing.FilteringBoundLogger:
+    """Get a bound logger for a module.
+
+    Production wraps loggers with ``make_filtering_bound_logger``; the debug
+    ``structlog.stdlib.BoundLogger`` offers the same interface.
+    """
     return structlog.get_logger(name)
@@ -6,8 +6,11 @@ communicates through these types — never raw dicts.
 
 from __future__ import annotations
 
+import secrets
+from collections import Counter
 from datetime import datetime, timezone
 from enum import StrEnum
+from operator import attrgetter
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -108,13 +111,14 @@ class AgentMetrics(BaseModel):
     completion_tokens: int = 0
     files_analyzed: int = 0
     comments_produced: int = 0
+    cached: bool = False  # Reused from an identical analysis earlier in the review
     error: str | None = None
 
 
 class ReviewResult(BaseModel):
     """Final aggregated review output for a PR."""
 
-    id: str = Field(default_factory=lambda: __import__("uuid").uuid4().hex[:12])
+    id: str = Field(default_factory=lambda: secrets.token_hex(6))
     pr_diff: PRDiff
     comments: list[ReviewComment] = Field(default_factory=list)
     summary: str = ""
@@ -126,9 +130,11 @@ class ReviewResult(BaseModel):
     @property
     def stats(self) -> dict[str, Any]:
         """Quick stats for logging / API response."""
+        severities = Counter(map(attrgetter("severity"), self.comments))
+        categories = Counter(map(attrgetter("category"), self.comments))
         return {
             "total_comments": len(self.comments),
-            "by_severity": {s.value: sum(1 for c in self.comments if c.severity == s) for s in Severity},
-            "by_category": {c.value: sum(1 for cm in self.comments if cm.category == c) for c in ReviewCategory},
+            "by_severity": {s.value: severities[s] for s in Severity},
+            "by_category": {c.value: categories[c] for c in ReviewCategory},
             "risk_score": self.risk_score.value,
         }
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from typing import Any
 
 import httpx
+import orjson
+from pydantic import TypeAdapter
 
 from lintwise.core.config import Settings
 from lintwise.core.exceptions import (
@@ -22,10 +25,12 @@ from lintwise.github.schemas import GitHubFile, GitHubPullRequest, GitHubReviewR
 
 logger = get_logger(__name__)
 
-# Pattern: https://github.com/{owner}/{repo}/pull/{number}
-_PR_URL_RE = re.compile(
-    r"https?://github\.com/(?P<owner>[^/]+)/(?P<repo>[^/]+)/pull/(?P<number>\d+)"
-)
+# Validates a page of the files listing straight from the response bytes
+_FILES_ADAPTER = TypeAdapter(list[GitHubFile])
+
+# Pattern: https://github.com/{owner}/{repo}/pull/{number}, optionally followed by
+# a sub-path, query or fragment (e.g. /files). Groups: owner, repo, number.
+_PR_URL_RE = re.compile(r"https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)(?:[/?#].*)?")
 
 
 def parse_pr_url(url: str) -> tuple[str, str, int]:
@@ -34,33 +39,46 @@ def parse_pr_url(url: str) -> tuple[str, str, int]:
     Raises:
         InvalidPRURLError: If the URL doesn't match expected format.
     """
-    match = _PR_URL_RE.match(url.strip())
+    match = _PR_URL_RE.fullmatch(url.strip())
     if not match:
         raise InvalidPRURLError(f"Cannot parse PR URL: {url}")
-    return match.group("owner"), match.group("repo"), int(match.group("number"))
+    owner, repo, number = match.groups()
+    return owner, repo, int(number)
+
+
+def _last_page(response: httpx.Response) -> int:
+    """Read the page count from a paginated response's ``Link: rel="last"`` URL."""
+    last = response.links.get("last")
+    if not last:
+        return 1
+    page = httpx.URL(last["url"]).params.get("page", "")
+    return int(page) if page.isdigit() else 1
 
 
 class GitHubClient:
     """Async client for the GitHub REST API.
 
-    Uses httpx with connection pooling for efficient async I/O.
+    Uses httpx over HTTP/2 with connection pooling for efficient async I/O.
     """
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._base_url = settings.github_api_base.rstrip("/")
+        self._headers = {
+            "Authorization": f"Bearer {settings.github_token.get_secret_value()}",
+            "Accept": "application/vnd.github.v3+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
         self._client: httpx.AsyncClient | None = None
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
+            # HTTP/2 lets concurrent page fetches share one connection
             self._client = httpx.AsyncClient(
                 base_url=self._base_url,
-                headers={
-                    "Authorization": f"Bearer {self._settings.github_token.get_secret_value()}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
+                headers=self._headers,
                 timeout=30.0,
+                http2=True,
             )
         return self._client
 
@@ -79,7 +97,7 @@ class GitHubClient:
         detail = f"{context} — HTTP {status}"
 
         try:
-            body = response.json()
+            body = orjson.loads(response.content)
             message = body.get("message", "")
             detail = f"{detail}: {message}"
         except Exception:
@@ -94,24 +112,33 @@ class GitHubClient:
             raise PRNotFoundError(detail)
         raise GitHubError(detail)
 
-    async def _get(self, path: str, params: dict[str, Any] | None = None) -> Any:
-        """Make an authenticated GET request."""
+    async def _get_response(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> httpx.Response:
+        """Make an authenticated GET request, returning the checked response."""
         client = await self._get_client()
         response = await client.get(path, params=params)
-        self._handle_error(response, context=f"GET {path}")
-        return response.json()
+        if not response.is_success:
+            self._handle_error(response, context=f"GET {path}")
+        return response
+
+    async def _get(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        """Make an authenticated GET request."""
+        response = await self._get_response(path, params=params)
+        return orjson.loads(response.content)
 
     async def _post(self, path: str, json: dict[str, Any]) -> Any:
         """Make an authenticated POST request."""
         client = await self._get_client()
         response = await client.post(path, json=json)
-        self._handle_error(response, context=f"POST {path}")
-        return response.json()
+        if not response.is_success:
+            self._handle_error(response, context=f"POST {path}")
+        return orjson.loads(response.content)
 
     async def get_pull_request(self, owner: str, repo: str, pr_number: int) -> GitHubPullRequest:
         """Fetch PR metadata."""
-        data = await self._get(f"/repos/{owner}/{repo}/pulls/{pr_number}")
-        return GitHubPullRequest.model_validate(data)
+        response = await self._get_response(f"/repos/{owner}/{repo}/pulls/{pr_number}")
+        return GitHubPullRequest.model_validate_json(response.content)
 
     async def get_pr_files(
         self,
@@ -120,26 +147,28 @@ class GitHubClient:
         pr_number: int,
         per_page: int = 100,
     ) -> list[GitHubFile]:
-        """Fetch all files changed in a PR (handles pagination)."""
-        all_files: list[GitHubFile] = []
-        page = 1
-
-        while True:
-            data = await self._get(
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/files",
-                params={"per_page": per_page, "page": page},
-            )
-
-            if not data:
-                break
-
-            all_files.extend(GitHubFile.model_validate(f) for f in data)
+        """Fetch all files changed in a PR (handles pagination).
 
-            if len(data) < per_page:
-                break
-            page += 1
+        The first page's ``Link`` header gives the page count, so the remaining
+        pages are fetched concurrently rather than one after another.
+        """
+        path = f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
+        first = await self._get_response(path, params={"per_page": per_page, "page": 1})
+        responses = [first]
+
+        last_page = _last_page(first)
+        if last_page > 1:
+            responses.extend(
+                await asyncio.gather(
+                    *(
+                        self._get_response(path, params={"per_page": per_page, "page": page})
+                        for page in range(2, last_page + 1)
+                    )
+                )
+            )
 
-        return all_files
+        # Parse and validate each page in one pass, without a dict intermediate
+        return [f for response in responses for f in _FILES_ADAPTER.validate_json(response.content)]
 
     async def get_pr_diff(self, owner: str, repo: str, pr_number: int) -> PRDiff:
         """Fetch a complete PRDiff: metadata + parsed files.
@@ -148,14 +177,19 @@ class GitHubClient:
         """
         logger.info("fetching_pr_diff", owner=owner, repo=repo, pr_number=pr_number)
 
-        # Fetch PR metadata and files in parallel
-        pr_data = await self.get_pull_request(owner, repo, pr_number)
-        pr_files = await self.get_pr_files(owner, repo, pr_number)
+        # Fetch PR metadata and files in parallel; if one fails the other is cancelled
+        try:
+            async with asyncio.TaskGroup() as tg:
+                pr_task = tg.create_task(self.get_pull_request(owner, repo, pr_number))
+                files_task = tg.create_task(self.get_pr_files(owner, repo, pr_number))
+        except ExceptionGroup as eg:
+            # Surface the first error itself so callers can keep catching GitHubError
+            raise eg.exceptions[0] from None
+        pr_data, pr_files = pr_task.result(), files_task.result()
 
         # Parse files into structured models
-        file_dicts = [f.model_dump() for f in pr_files]
         parsed_files, skipped = parse_pr_files(
-            file_dicts,
+            pr_files,
             max_files=self._settings.max_files_per_review,
             max_lines=self._settings.max_diff_lines,
         )
@@ -2,67 +2,62 @@
 
 from __future__ import annotations
 
+from collections import Counter
+from operator import attrgetter
+
 from lintwise.core.logging import get_logger
-from lintwise.core.models import ReviewComment, ReviewResult
+from lintwise.core.models import ReviewComment, ReviewResult, Severity
 from lintwise.github.schemas import GitHubReviewComment, GitHubReviewRequest
 
 logger = get_logger(__name__)
 
 
+_SEVERITY_EMOJI: dict[Severity, str] = {
+    Severity.CRITICAL: "🔴",
+    Severity.WARNING: "🟡",
+    Severity.SUGGESTION: "🔵",
+    Severity.NITPICK: "⚪",
+}
+
+# Upper-case heading label per severity, e.g. "CRITICAL"
+_SEVERITY_LABEL: dict[Severity, str] = {s: s.value.upper() for s in Severity}
+
+
 def build_review_body(result: ReviewResult) -> str:
     """Build the top-level review summary body in Markdown."""
-    lines = [
-        f"## 🔍 Lintwise Review — {result.risk_score.value.upper()} Risk",
-        "",
-        result.summary or "Analysis complete.",
-        "",
+    # One pass over the comments; only the severity breakdown is needed here
+    by_severity = Counter(map(attrgetter("severity"), result.comments))
+    return (
+        f"## 🔍 Lintwise Review — {result.risk_score.value.upper()} Risk\n"
+        "\n"
+        f"{result.summary or 'Analysis complete.'}\n"
+        "\n"
         f"**{len(result.comments)} comments** across "
         f"{len(result.pr_diff.files)} files "
-        f"({result.total_duration_ms / 1000:.1f}s)",
-        "",
-    ]
-
-    # Stats breakdown
-    stats = result.stats
-    sev_parts = [
-        f"🔴 {stats['by_severity']['critical']} critical",
-        f"🟡 {stats['by_severity']['warning']} warnings",
-        f"🔵 {stats['by_severity']['suggestion']} suggestions",
-        f"⚪ {stats['by_severity']['nitpick']} nitpicks",
-    ]
-    lines.append(" | ".join(sev_parts))
-
-    return "\n".join(lines)
+        f"({result.total_duration_ms / 1000:.1f}s)\n"
+        "\n"
+        f"🔴 {by_severity[Severity.CRITICAL]} critical | "
+        f"🟡 {by_severity[Severity.WARNING]} warnings | "
+        f"🔵 {by_severity[Severity.SUGGESTION]} suggestions | "
+        f"⚪ {by_severity[Severity.NITPICK]} nitpicks"
+    )
 
 
 def format_inline_comment(comment: ReviewComment) -> str:
     """Format a ReviewComment into a Markdown inline comment body."""
-    severity_emoji = {
-        "critical": "🔴",
-        "warning": "🟡",
-        "suggestion": "🔵",
-        "nitpick": "⚪",
-    }
-
-    emoji = severity_emoji.get(comment.severity.value, "💬")
-    lines = [
-        f"**{emoji} {comment.severity.value.upper()}** — {comment.title}",
-        "",
-        comment.body,
-    ]
-
-    if comment.suggestion:
-        lines.extend([
-            "",
-            "**Suggested fix:**",
-            f"```suggestion",
-            comment.suggestion,
-            "```",
-        ])
-
-    lines.append(f"\n*Confidence: {comment.confidence:.0%} | Agent: {comment.agent_name}*")
-
-    return "\n".join(lines)
+    emoji = _SEVERITY_EMOJI.get(comment.severity, "💬")
+    fix = (
+        f"\n\n**Suggested fix:**\n```suggestion\n{comment.suggestion}\n```"
+        if comment.suggestion
+        else ""
+    )
+    return (
+        f"**{emoji} {_SEVERITY_LABEL[comment.severity]}** — {comment.title}\n"
+        "\n"
+        f"{comment.body}{fix}\n"
+        "\n"
+        f"*Confidence: {comment.confidence:.0%} | Agent: {comment.agent_name}*"
+    )
 
 
 def build_review_request(result: ReviewResult) -> GitHubReviewRequest:
@@ -70,7 +65,9 @@ def build_review_request(result: ReviewResult) -> GitHubReviewRequest:
 
     Only includes comments that have a valid line number for inline placement.
     Comments without line numbers contribute to the summary but aren't posted inline.
+    The review comments are already validated, so payload models skip re-validation.
     """
+    construct = GitHubReviewComment.model_construct
     inline_comments: list[GitHubReviewComment] = []
     general_comments: list[str] = []
 
@@ -79,7 +76,7 @@ def build_review_request(result: ReviewResult) -> GitHubReviewRequest:
 
         if comment.line is not None:
             inline_comments.append(
-                GitHubReviewComment(
+                construct(
                     path=comment.file,
                     line=comment.line,
                     body=formatted_body,
@@ -99,7 +96,7 @@ def build_review_request(result: ReviewResult) -> GitHubReviewRequest:
         general_count=len(general_comments),
     )
 
-    return GitHubReviewRequest(
+    return GitHubReviewRequest.model_construct(
         event="COMMENT",
         body=body,
         comments=inline_comments,
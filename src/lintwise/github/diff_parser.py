@@ -3,15 +3,32 @@
 from __future__ import annotations
 
 import re
+from typing import TYPE_CHECKING
 
 from lintwise.core.constants import SKIP_PATTERNS, detect_language
 from lintwise.core.models import FileChange, FileStatus, HunkRange
 
+if TYPE_CHECKING:
+    from lintwise.github.schemas import GitHubFile
+
 # Matches: @@ -10,5 +12,7 @@ optional context
-_HUNK_HEADER_RE = re.compile(
-    r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$",
-    re.MULTILINE,
-)
+# Anchored on the preceding newline rather than ^ with re.MULTILINE: the literal
+# "\n@@ -" prefix lets the engine skip ahead to candidates instead of trying
+# every line start. parse_patch prepends a newline so the first line matches.
+_HUNK_HEADER_RE = re.compile(r"\n@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@([^\n]*)")
+
+
+def count_marked_lines(patch: str, marker: str) -> int:
+    """Count lines starting with ``marker``, excluding ``+++``/``---`` file headers.
+
+    Uses substring counts over the whole patch instead of a per-line loop; the
+    first line has no preceding newline, so it is checked separately.
+    """
+    header = marker * 3
+    count = patch.count("\n" + marker) - patch.count("\n" + header)
+    if patch.startswith(marker) and not patch.startswith(header):
+        count += 1
+    return count
 
 
 def parse_patch(filename: str, patch: str, status: str = "modified") -> FileChange:
@@ -34,31 +51,27 @@ def parse_patch(filename: str, patch: str, status: str = "modified") -> FileChan
     deletions = 0
 
     if patch:
-        for match in _HUNK_HEADER_RE.finditer(patch):
-            new_start = int(match.group(3))
-            new_count = int(match.group(4)) if match.group(4) else 1
-
-            # Extract the hunk body: everything from this @@ to next @@ or end
-            hunk_start = match.end()
-            next_match = _HUNK_HEADER_RE.search(patch, hunk_start)
-            hunk_body = patch[hunk_start : next_match.start()] if next_match else patch[hunk_start:]
-
+        text = "\n" + patch
+        matches = list(_HUNK_HEADER_RE.finditer(text))
+        # Each hunk body runs from the end of its header to the start of the next
+        # one; a patch without hunk headers has no hunks (and no ends)
+        ends = [m.start() for m in matches[1:]] + ([len(text)] if matches else [])
+
+        for match, end in zip(matches, ends, strict=True):
+            new_start, new_count = match.group(3, 4)
             hunks.append(
-                HunkRange(
-                    start_line=new_start,
-                    line_count=new_count,
-                    content=hunk_body.strip(),
+                HunkRange.model_construct(
+                    start_line=int(new_start),
+                    line_count=int(new_count) if new_count else 1,
+                    content=text[match.end() : end].strip(),
                 )
             )
 
-        # Count additions/deletions from the patch lines
-        for line in patch.splitlines():
-            if line.startswith("+") and not line.startswith("+++"):
-                additions += 1
-            elif line.startswith("-") and not line.startswith("---"):
-                deletions += 1
+        additions = count_marked_lines(patch, "+")
+        deletions = count_marked_lines(patch, "-")
 
-    return FileChange(
+    # Every field is built here from already-typed values, so skip re-validation
+    return FileChange.model_construct(
         filename=filename,
         status=FileStatus(normalised),
         patch=patch,
@@ -70,24 +83,22 @@ def parse_patch(filename: str, patch: str, status: str = "modified") -> FileChan
 
 
 def should_skip_file(filename: str) -> bool:
-    """Check if a file should be excluded from review."""
-    import os
-
-    basename = os.path.basename(filename)
-    return basename in SKIP_PATTERNS
+    """Check if a file should be excluded from review (by its basename)."""
+    return filename.rpartition("/")[2] in SKIP_PATTERNS
 
 
 def parse_pr_files(
-    files: list[dict],
+    files: list[GitHubFile],
     max_files: int = 50,
     max_lines: int = 5000,
 ) -> tuple[list[FileChange], list[str]]:
-    """Parse a list of GitHub file dicts into FileChange models.
+    """Parse a list of GitHub file entries into FileChange models.
 
     Args:
-        files: Raw file dicts from GitHub API (GET /pulls/{n}/files).
+        files: Validated file entries from GitHub API (GET /pulls/{n}/files).
         max_files: Maximum number of files to include.
-        max_lines: Maximum total diff lines before truncation.
+        max_lines: Maximum total changed lines (additions + deletions) before
+            truncation.
 
     Returns:
         Tuple of (parsed FileChange list, list of skipped file names).
@@ -97,7 +108,7 @@ def parse_pr_files(
     total_lines = 0
 
     for f in files:
-        filename = f.get("filename", "")
+        filename = f.filename
 
         # Skip non-substantive files
         if should_skip_file(filename):
@@ -105,13 +116,17 @@ def parse_pr_files(
             continue
 
         # Skip files without patches (binary, etc.)
-        patch = f.get("patch", "") or ""
+        patch = f.patch or ""
         if not patch:
             skipped.append(filename)
             continue
 
-        # Enforce diff-size limit
-        patch_lines = patch.count("\n") + 1
+        # Enforce diff-size limit, using GitHub's per-file change counts; the
+        # patch is only scanned when those counts are missing
+        if {"additions", "deletions"} <= f.model_fields_set:
+            patch_lines = f.additions + f.deletions
+        else:
+            patch_lines = patch.count("\n") + 1
         if total_lines + patch_lines > max_lines:
             skipped.append(filename)
             continue
@@ -121,7 +136,7 @@ def parse_pr_files(
         file_change = parse_patch(
             filename=filename,
             patch=patch,
-            status=f.get("status", "modified"),
+            status=f.status,
         )
         parsed.append(file_change)
 
@@ -12,20 +12,21 @@ from lintwise.github.schemas import WebhookEvent
 logger = get_logger(__name__)
 
 # Events we act on
-ACTIONABLE_EVENTS = {
+ACTIONABLE_EVENTS: frozenset[tuple[str, str]] = frozenset({
     ("pull_request", "opened"),
     ("pull_request", "synchronize"),
     ("pull_request", "reopened"),
-}
+})
 
 
-def verify_signature(payload: bytes, signature: str, secret: str) -> bool:
+def verify_signature(payload: bytes, signature: str, secret: str | bytes) -> bool:
     """Verify GitHub webhook HMAC-SHA256 signature.
 
     Args:
         payload: Raw request body bytes.
         signature: Value of X-Hub-Signature-256 header (e.g. 'sha256=abc...').
-        secret: Webhook secret configured in GitHub.
+        secret: Webhook secret configured in GitHub, as text or already
+            UTF-8 encoded (lets callers encode it once).
 
     Returns:
         True if signature is valid, False otherwise.
@@ -34,7 +35,7 @@ def verify_signature(payload: bytes, signature: str, secret: str) -> bool:
         return False
 
     expected = "sha256=" + hmac.new(
-        key=secret.encode("utf-8"),
+        key=secret if isinstance(secret, bytes) else secret.encode("utf-8"),
         msg=payload,
         digestmod=hashlib.sha256,
     ).hexdigest()
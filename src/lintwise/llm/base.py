@@ -14,6 +14,7 @@ class LLMResponse(BaseModel):
     content: str
     prompt_tokens: int = 0
     completion_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
     model: str = ""
 
 
@@ -32,6 +33,7 @@ class LLMProvider(ABC):
         temperature: float = 0.1,
         max_tokens: int = 4096,
         response_format: dict[str, Any] | None = None,
+        user: str | None = None,
     ) -> LLMResponse:
         """Send a chat completion request.
 
@@ -40,6 +42,9 @@ class LLMProvider(ABC):
             temperature: Sampling temperature (0.0 = deterministic).
             max_tokens: Max tokens in the response.
             response_format: Optional format spec (e.g. {"type": "json_object"}).
+            user: Optional caller identifier. Requests that share a prompt prefix
+                should pass the same value so the provider can route them to
+                the same prompt cache.
 
         Returns:
             LLMResponse with content and token usage.
@@ -54,6 +59,21 @@ class LLMProvider(ABC):
         """
         ...
 
+    def estimate_tokens(self, text: str) -> int:
+        """Cheap token estimate (~4 characters per token) without tokenizing.
+
+        Good enough for rate-limit pacing; use ``count_tokens`` where an
+        exact count matters.
+        """
+        return len(text) // 4
+
+    async def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        """Count tokens for several texts, in input order.
+
+        Providers with a native batch tokenizer should override this.
+        """
+        return [await self.count_tokens(text) for text in texts]
+
     @abstractmethod
     async def close(self) -> None:
         """Release any held resources."""
@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+from collections import OrderedDict
 from typing import Any
 
 import tiktoken
-from openai import AsyncOpenAI
+from openai import (
+    APIError,
+    AsyncOpenAI,
+    BadRequestError,
+    DefaultAsyncHttpxClient,
+    RateLimitError,
+    Timeout,
+)
 
 from lintwise.core.config import Settings
 from lintwise.core.exceptions import (
@@ -19,24 +29,59 @@ from lintwise.llm.base import LLMProvider, LLMResponse
 
 logger = get_logger(__name__)
 
+# Token counts remembered per provider (LRU). Keys are content digests, so large
+# patches are not kept alive just to be cache keys.
+_TOKEN_COUNT_CACHE_SIZE = 10_000
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+@functools.lru_cache(maxsize=32)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Tokenizer for a model, shared by every provider instance using it.
+
+    Best-effort: unknown models fall back to ``cl100k_base``.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _create_client(api_key: str, timeout: float) -> AsyncOpenAI:
+    """AsyncOpenAI client on one pooled HTTP/2 transport.
+
+    Concurrent agent calls multiplex over kept-alive connections instead of
+    paying a TLS handshake each. The SDK's default pool limits
+    (``openai.DEFAULT_CONNECTION_LIMITS``) already exceed the pipeline's fan-out.
+    """
+    return AsyncOpenAI(
+        api_key=api_key,
+        http_client=DefaultAsyncHttpxClient(
+            http2=True,
+            timeout=Timeout(timeout, connect=5.0),
+        ),
+    )
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI / GPT-4 LLM adapter using the official async client."""
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
-        self._client = AsyncOpenAI(
-            api_key=settings.openai_api_key.get_secret_value(),
+        # Each provider owns its client; the app keeps one provider for its lifetime
+        self._client = _create_client(
+            settings.openai_api_key.get_secret_value(),
+            settings.review_timeout_seconds,
         )
         self._model = settings.openai_model
         self._default_temp = settings.openai_temperature
         self._default_max_tokens = settings.openai_max_tokens
 
-        # Tokenizer (best-effort: fall back to cl100k_base for unknown models)
-        try:
-            self._encoding = tiktoken.encoding_for_model(self._model)
-        except KeyError:
-            self._encoding = tiktoken.get_encoding("cl100k_base")
+        self._encoding = _get_encoding(self._model)
+        self._token_counts: OrderedDict[bytes, int] = OrderedDict()
 
     async def complete(
         self,
@@ -45,10 +90,12 @@ class OpenAIProvider(LLMProvider):
         temperature: float | None = None,
         max_tokens: int | None = None,
         response_format: dict[str, Any] | None = None,
+        user: str | None = None,
     ) -> LLMResponse:
         """Send a chat completion to OpenAI.
 
-        Handles rate limits, context overflow, and malformed responses.
+        Handles rate limits, context overflow, and malformed responses. SDK
+        errors are mapped to LLM exceptions by type; anything else propagates.
         """
         temp = temperature if temperature is not None else self._default_temp
         max_tok = max_tokens if max_tokens is not None else self._default_max_tokens
@@ -62,33 +109,74 @@ class OpenAIProvider(LLMProvider):
 
         if response_format:
             kwargs["response_format"] = response_format
+        if user:
+            kwargs["user"] = user
 
         try:
             response = await self._client.chat.completions.create(**kwargs)
-        except Exception as e:
-            error_str = str(e).lower()
-            if "rate limit" in error_str or "429" in error_str:
-                raise LLMRateLimitError(f"OpenAI rate limit: {e}") from e
-            if "context" in error_str or "maximum" in error_str or "token" in error_str:
+        except RateLimitError as e:
+            raise LLMRateLimitError(f"OpenAI rate limit: {e}") from e
+        except BadRequestError as e:
+            if e.code == "context_length_exceeded":
                 raise LLMContextOverflowError(f"Context overflow: {e}") from e
             raise LLMError(f"OpenAI API error: {e}") from e
+        except APIError as e:
+            raise LLMError(f"OpenAI API error: {e}") from e
 
         choice = response.choices[0] if response.choices else None
         if not choice or not choice.message.content:
             raise LLMResponseParseError("Empty response from OpenAI")
 
         usage = response.usage
+        details = usage.prompt_tokens_details if usage else None
         return LLMResponse(
             content=choice.message.content,
             prompt_tokens=usage.prompt_tokens if usage else 0,
             completion_tokens=usage.completion_tokens if usage else 0,
+            cached_tokens=(details.cached_tokens or 0) if details else 0,
             model=response.model or self._model,
         )
 
+    def _remember_count(self, key: bytes, count: int) -> None:
+        self._token_counts[key] = count
+        if len(self._token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+            self._token_counts.popitem(last=False)
+
     async def count_tokens(self, text: str) -> int:
-        """Count tokens using tiktoken."""
-        return len(self._encoding.encode(text))
+        """Count tokens using tiktoken, reusing counts for previously seen text."""
+        key = _text_key(text)
+        count = self._token_counts.get(key)
+        if count is None:
+            count = len(self._encoding.encode(text))
+            self._remember_count(key, count)
+        else:
+            self._token_counts.move_to_end(key)
+        return count
+
+    async def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        """Count tokens for several texts with tiktoken's threaded batch encoder.
+
+        Only texts missing from the count cache are encoded.
+        """
+        keys = [_text_key(text) for text in texts]
+        counts: dict[bytes, int] = {}
+        missing: dict[bytes, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            count = self._token_counts.get(key)
+            if count is None:
+                missing[key] = text
+            else:
+                self._token_counts.move_to_end(key)
+                counts[key] = count
+
+        if missing:
+            encoded = self._encoding.encode_batch(list(missing.values()))
+            for key, ids in zip(missing, encoded, strict=True):
+                counts[key] = len(ids)
+                self._remember_count(key, len(ids))
+
+        return [counts[key] for key in keys]
 
     async def close(self) -> None:
-        """Close the async client."""
+        """Close the underlying async client."""
         await self._client.close()
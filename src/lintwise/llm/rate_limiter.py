@@ -3,13 +3,37 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import time
+from typing import TYPE_CHECKING
 
 from lintwise.core.logging import get_logger
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
 logger = get_logger(__name__)
 
 
+class TokenReservation:
+    """Tokens held by one ``TokenBucketRateLimiter.slot``.
+
+    Set ``used`` to the request's actual token usage before the slot exits;
+    the rest of the reservation is then returned to the bucket.
+    """
+
+    def __init__(self, reserved: int) -> None:
+        self.reserved = reserved
+        self.used: int | None = None
+
+    @property
+    def unused(self) -> int:
+        """Reserved tokens the request did not use (0 while usage is unknown)."""
+        if self.used is None:
+            return 0
+        return max(0, self.reserved - self.used)
+
+
 class TokenBucketRateLimiter:
     """Async rate limiter using the token-bucket algorithm.
 
@@ -26,6 +50,10 @@ class TokenBucketRateLimiter:
         self._rpm = rpm
         self._tpm = tpm
         self._semaphore = asyncio.Semaphore(max_concurrent)
+        # Guards bucket state; never held while sleeping
+        self._lock = asyncio.Lock()
+        # Set (and immediately cleared) when tokens are returned early
+        self._wakeup = asyncio.Event()
 
         # Token buckets
         self._request_tokens = float(rpm)
@@ -45,26 +73,69 @@ class TokenBucketRateLimiter:
     async def acquire(self, estimated_tokens: int = 1000) -> None:
         """Wait until a request can proceed.
 
+        The concurrency slot is taken first, so bucket tokens are only spent
+        once the request is actually about to run.
+
         Args:
-            estimated_tokens: Estimated token usage for this request.
+            estimated_tokens: Estimated token usage for this request. Capped at
+                the TPM limit, since a larger request could never be admitted.
         """
+        await self._semaphore.acquire()
+        try:
+            await self._consume(min(estimated_tokens, self._tpm))
+        except BaseException:
+            # Cancelled (or failed) while waiting on the bucket: give the slot back
+            self._semaphore.release()
+            raise
+
+    async def _consume(self, estimated_tokens: int) -> None:
+        """Deduct one request and ``estimated_tokens`` once the buckets allow it."""
         while True:
-            self._refill()
+            async with self._lock:
+                self._refill()
 
-            if self._request_tokens >= 1 and self._token_tokens >= estimated_tokens:
-                self._request_tokens -= 1
-                self._token_tokens -= estimated_tokens
-                break
+                if self._request_tokens >= 1 and self._token_tokens >= estimated_tokens:
+                    self._request_tokens -= 1
+                    self._token_tokens -= estimated_tokens
+                    return
 
-            # Wait proportionally to how many tokens we need
-            wait_time = max(0.1, min(5.0, estimated_tokens / (self._tpm / 60)))
-            await asyncio.sleep(wait_time)
+                # Time until both buckets have refilled enough for this request
+                needed_requests = max(0.0, 1 - self._request_tokens)
+                needed_tokens = max(0.0, estimated_tokens - self._token_tokens)
+                wait_time = max(needed_requests * 60 / self._rpm, needed_tokens * 60 / self._tpm)
+                wakeup = self._wakeup
 
-        await self._semaphore.acquire()
+            # Wait outside the lock so other waiters can check the bucket meanwhile;
+            # returned tokens wake us before the refill would.
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), timeout=wait_time)
 
-    def release(self) -> None:
-        """Release the concurrency semaphore after a request completes."""
+    def release(self, unused_tokens: int = 0) -> None:
+        """Release the concurrency semaphore after a request completes.
+
+        Args:
+            unused_tokens: Part of the estimate the request did not use. It is
+                returned to the token bucket and waiting callers are woken.
+        """
         self._semaphore.release()
+        if unused_tokens > 0:
+            self._token_tokens = min(self._tpm, self._token_tokens + unused_tokens)
+            self._wakeup.set()
+            self._wakeup.clear()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, estimated_tokens: int = 1000) -> AsyncIterator[TokenReservation]:
+        """Hold a rate-limited slot sized for ``estimated_tokens`` for the block.
+
+        Yields the reservation; recording the actual usage on it returns the
+        unused part of the estimate when the block exits.
+        """
+        await self.acquire(estimated_tokens)
+        reservation = TokenReservation(min(estimated_tokens, self._tpm))
+        try:
+            yield reservation
+        finally:
+            self.release(unused_tokens=reservation.unused)
 
     async def __aenter__(self) -> TokenBucketRateLimiter:
         await self.acquire()
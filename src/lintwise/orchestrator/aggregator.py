@@ -2,12 +2,120 @@
 
 from __future__ import annotations
 
+import bisect
+import heapq
+from typing import TYPE_CHECKING, Any, TypeVar
+
 from lintwise.core.constants import RISK_THRESHOLDS, SEVERITY_WEIGHTS
 from lintwise.core.logging import get_logger
-from lintwise.core.models import ReviewComment, RiskScore
+from lintwise.core.models import ReviewComment, RiskScore, Severity
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 logger = get_logger(__name__)
 
+# Rank of each severity in review output (critical first)
+_SEVERITY_ORDER: dict[Severity, int] = {
+    Severity.CRITICAL: 0,
+    Severity.WARNING: 1,
+    Severity.SUGGESTION: 2,
+    Severity.NITPICK: 3,
+}
+
+# Risk weight per severity, keyed by the enum so hot paths skip the ``.value`` lookup
+_SEVERITY_WEIGHT: dict[Severity, int] = {s: SEVERITY_WEIGHTS.get(s.value, 0) for s in Severity}
+
+# Risk bands: a total weight above _RISK_BOUNDS[i] (and at most the next bound)
+# maps to _RISK_LEVELS[i + 1]
+_RISK_BOUNDS: tuple[int, ...] = (
+    RISK_THRESHOLDS["low"],
+    RISK_THRESHOLDS["medium"],
+    RISK_THRESHOLDS["high"],
+)
+_RISK_LEVELS: tuple[RiskScore, ...] = (
+    RiskScore.LOW,
+    RiskScore.MEDIUM,
+    RiskScore.HIGH,
+    RiskScore.CRITICAL,
+)
+
+
+# (file, line, normalised title) — comments sharing a key flag the same issue
+_DedupKey = tuple[str, int | None, str]
+# Position of a comment in overall result order: (batch index, offset in batch)
+_Position = tuple[int, int]
+
+_T = TypeVar("_T")
+
+
+class CommentAggregator:
+    """Incremental deduplication and risk weighting for agent results.
+
+    Batches may be added in any order (e.g. as agent tasks complete). Each batch
+    carries its index in the overall task order, and the outcome is the same
+    as aggregating all batches concatenated in index order: the highest
+    confidence comment wins per key, with ties going to the earliest one.
+    """
+
+    def __init__(self) -> None:
+        # key → (position first seen, position of kept comment, kept comment)
+        self._seen: dict[_DedupKey, tuple[_Position, _Position, ReviewComment]] = {}
+        self._total_weight = 0
+        self._received = 0
+
+    def add(self, comments: list[ReviewComment], index: int = 0) -> None:
+        """Fold a batch of comments in, deduplicating against everything seen so far."""
+        seen = self._seen
+        weight = _SEVERITY_WEIGHT
+        for offset, comment in enumerate(comments):
+            pos = (index, offset)
+            # Dedup key: location plus normalised title (no intermediate string)
+            key = (comment.file, comment.line, comment.title.strip().casefold())
+
+            entry = seen.get(key)
+            if entry is None:
+                seen[key] = (pos, pos, comment)
+                self._total_weight += weight[comment.severity]
+                continue
+
+            first, kept_pos, kept = entry
+            if comment.confidence > kept.confidence or (
+                comment.confidence == kept.confidence and pos < kept_pos
+            ):
+                # Keep higher confidence; the running weight follows the kept comment
+                self._total_weight += weight[comment.severity] - weight[kept.severity]
+                kept_pos, kept = pos, comment
+            seen[key] = (min(first, pos), kept_pos, kept)
+
+        self._received += len(comments)
+
+    def _kept_entries(self) -> list[tuple[_Position, _Position, ReviewComment]]:
+        entries = list(self._seen.values())
+        removed = self._received - len(entries)
+        if removed:
+            logger.info("deduplicated_comments", removed=removed, remaining=len(entries))
+        return entries
+
+    def deduplicated(self) -> list[ReviewComment]:
+        """Kept comments, in order of each issue's first occurrence."""
+        return [comment for _, _, comment in sorted(self._kept_entries(), key=lambda e: e[0])]
+
+    def result(self, top_k: int | None = None) -> tuple[list[ReviewComment], RiskScore]:
+        """Ranked kept comments and the overall risk score.
+
+        Ranks in a single sort; first occurrence breaks ties, matching
+        ``rank_comments(self.deduplicated(), top_k)``. The risk score always
+        covers every kept comment, even when only the top ``top_k`` are returned.
+        """
+        order = _SEVERITY_ORDER
+        ranked = _top(
+            self._kept_entries(),
+            key=lambda e: (order[e[2].severity], -e[2].confidence, e[0]),
+            k=top_k,
+        )
+        return [comment for _, _, comment in ranked], _risk_for_weight(self._total_weight)
+
 
 def deduplicate_comments(comments: list[ReviewComment]) -> list[ReviewComment]:
     """Remove duplicate comments that flag the same issue at the same location.
@@ -16,59 +124,57 @@ def deduplicate_comments(comments: list[ReviewComment]) -> list[ReviewComment]:
     - Same file + same line + similar title (case-insensitive)
     - When duplicates exist, keep the one with highest confidence
     """
-    seen: dict[str, ReviewComment] = {}
-
-    for comment in comments:
-        # Build dedup key
-        key = f"{comment.file}:{comment.line}:{comment.title.lower().strip()}"
+    aggregator = CommentAggregator()
+    aggregator.add(comments)
+    return aggregator.deduplicated()
 
-        if key in seen:
-            # Keep higher confidence
-            if comment.confidence > seen[key].confidence:
-                seen[key] = comment
-        else:
-            seen[key] = comment
 
-    deduped = list(seen.values())
-    removed = len(comments) - len(deduped)
-    if removed:
-        logger.info("deduplicated_comments", removed=removed, remaining=len(deduped))
-
-    return deduped
+def rank_comments(comments: list[ReviewComment], top_k: int | None = None) -> list[ReviewComment]:
+    """Sort comments by severity (critical first), then by confidence.
 
+    With ``top_k``, only the first ``top_k`` comments of that order are returned.
+    """
+    order = _SEVERITY_ORDER
+    return _top(comments, key=lambda c: (order[c.severity], -c.confidence), k=top_k)
 
-def rank_comments(comments: list[ReviewComment]) -> list[ReviewComment]:
-    """Sort comments by severity (critical first), then by confidence."""
-    severity_order = {"critical": 0, "warning": 1, "suggestion": 2, "nitpick": 3}
 
-    return sorted(
-        comments,
-        key=lambda c: (severity_order.get(c.severity.value, 99), -c.confidence),
-    )
+def _top(items: list[_T], key: Callable[[_T], Any], k: int | None) -> list[_T]:
+    """``sorted(items, key=key)[:k]``, using a heap when only a few items are wanted."""
+    if k is None or k >= len(items):
+        return sorted(items, key=key)
+    return heapq.nsmallest(k, items, key=key)
 
 
 def compute_risk_score(comments: list[ReviewComment]) -> RiskScore:
     """Compute overall PR risk score from weighted comment severities."""
-    total_weight = sum(
-        SEVERITY_WEIGHTS.get(c.severity.value, 0) for c in comments
-    )
+    weight = _SEVERITY_WEIGHT
+    return _risk_for_weight(sum(weight[c.severity] for c in comments))
+
 
-    if total_weight > RISK_THRESHOLDS["high"]:
-        return RiskScore.CRITICAL
-    if total_weight > RISK_THRESHOLDS["medium"]:
-        return RiskScore.HIGH
-    if total_weight > RISK_THRESHOLDS["low"]:
-        return RiskScore.MEDIUM
-    return RiskScore.LOW
+def _risk_for_weight(total_weight: int) -> RiskScore:
+    """Map a total severity weight onto the risk thresholds (exceeding a bound raises the level)."""
+    return _RISK_LEVELS[bisect.bisect_left(_RISK_BOUNDS, total_weight)]
 
 
-def aggregate_comments(comments: list[ReviewComment]) -> tuple[list[ReviewComment], RiskScore]:
+def aggregate_comments(
+    comments: list[ReviewComment], top_k: int | None = None
+) -> tuple[list[ReviewComment], RiskScore]:
     """Full aggregation pipeline: deduplicate → rank → compute risk.
 
+    Deduplication accumulates the severity weight as it goes, so the comments
+    are walked once and then sorted once.
+
+    Args:
+        comments: Comments from all agents.
+        top_k: Optional limit on the number of ranked comments returned.
+            The risk score still reflects all deduplicated comments.
+
     Returns:
         Tuple of (ranked comments, risk score).
     """
-    deduped = deduplicate_comments(comments)
-    ranked = rank_comments(deduped)
-    risk = compute_risk_score(ranked)
-    return ranked, risk
+    if not comments:
+        # PR with no findings: nothing to deduplicate, rank or weigh
+        return [], RiskScore.LOW
+    aggregator = CommentAggregator()
+    aggregator.add(comments)
+    return aggregator.result(top_k)
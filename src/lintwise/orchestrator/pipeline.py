@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import time
 
 from lintwise.agents.base import ReviewAgent
@@ -16,104 +17,195 @@ from lintwise.core.models import (
     ReviewResult,
 )
 from lintwise.llm.base import LLMProvider
-from lintwise.orchestrator.aggregator import aggregate_comments
+from lintwise.llm.rate_limiter import TokenBucketRateLimiter
+from lintwise.orchestrator.aggregator import CommentAggregator
 
 logger = get_logger(__name__)
 
 
-async def _run_agent_on_file(
+async def _run_agent_on_files(
     agent: ReviewAgent,
-    file_change: FileChange,
+    files: list[FileChange],
     context: PRDiff,
     timeout: float,
+    messages: list[dict[str, str]] | None = None,
 ) -> tuple[list[ReviewComment], AgentMetrics]:
-    """Run a single agent on a single file with a timeout."""
+    """Run a single agent on a batch of files (one LLM request) with a timeout."""
     try:
         return await asyncio.wait_for(
-            agent.analyze(file_change, context),
+            agent.analyze_batch(files, context, messages),
             timeout=timeout,
         )
     except asyncio.TimeoutError:
         logger.warning(
             "agent_timeout",
             agent=agent.name,
-            file=file_change.filename,
+            files=[f.filename for f in files],
             timeout=timeout,
         )
         return [], AgentMetrics(
             agent_name=agent.name,
-            files_analyzed=1,
+            files_analyzed=len(files),
             error=f"Timeout after {timeout}s",
         )
 
 
+# A (comments, metrics) pair as returned by an agent
+_Analysis = tuple[list[ReviewComment], AgentMetrics]
+# A finished analysis together with the files it was run on
+_SharedAnalysis = tuple[list[FileChange], _Analysis]
+
+
+def _content_key(files: list[FileChange]) -> bytes:
+    """Digest of what an agent sees of a batch, ignoring the file names."""
+    h = hashlib.blake2b(digest_size=16)
+    for f in files:
+        h.update(f"{f.language}\0{len(f.patch)}\0".encode())
+        h.update(f.patch.encode())
+    return h.digest()
+
+
+def _reuse_analysis(
+    source: list[FileChange], analysis: _Analysis, files: list[FileChange]
+) -> _Analysis:
+    """Relabel another batch's analysis for ``files``, which have identical content."""
+    comments, metrics = analysis
+    renamed = {src.filename: dst.filename for src, dst in zip(source, files, strict=True)}
+    return (
+        [c.model_copy(update={"file": renamed.get(c.file, c.file)}) for c in comments],
+        metrics.model_copy(
+            update={"cached": True, "duration_ms": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        ),
+    )
+
+
 async def run_review(
     pr_diff: PRDiff,
     llm: LLMProvider,
     agents: list[ReviewAgent] | None = None,
     max_concurrent: int = 4,
     timeout_per_agent: float = 60.0,
+    rate_limiter: TokenBucketRateLimiter | None = None,
+    files_per_request: int = 1,
+    max_completion_tokens: int = 4096,
 ) -> ReviewResult:
     """Execute the full review pipeline.
 
-    1. For each file, fan out to all agents in parallel
-    2. Collect results with fault tolerance (partial results on failure)
-    3. Aggregate: deduplicate, rank, compute risk score
+    1. Group the files into batches and fan each batch out to all agents in parallel;
+       batches with identical content are analyzed once per agent and reused
+    2. Collect results as they complete, with fault tolerance (partial results
+       on failure), deduplicating each batch while slower tasks are still running
+    3. Rank and compute the risk score
     4. Return the final ReviewResult
 
     Args:
         pr_diff: The PR to review.
         llm: LLM provider for agents.
         agents: Optional list of pre-created agents. Creates all if None.
-        max_concurrent: Maximum concurrent agent tasks.
-        timeout_per_agent: Per-agent per-file timeout in seconds.
+        max_concurrent: Maximum concurrent agent tasks. Only used when no
+            rate_limiter is given; a limiter applies its own concurrency cap.
+        timeout_per_agent: Per-agent per-request timeout in seconds.
+        rate_limiter: Optional limiter shared across reviews. A fresh one is
+            created for this review if None.
+        files_per_request: Number of files each agent reviews in one LLM
+            request. Batching several files (e.g. 4) cuts the request count and
+            per-call overhead; keep the batch within the model's context.
+        max_completion_tokens: The ``max_tokens`` each request is sent with.
+            Providers charge it against TPM when admitting the request, so it
+            is reserved on the limiter along with the prompt.
 
     Returns:
         Aggregated ReviewResult.
     """
-    start_ms = time.perf_counter_ns() // 1_000_000
+    start = time.monotonic()
 
     if agents is None:
         agents = create_all_agents(llm)
 
-    semaphore = asyncio.Semaphore(max_concurrent)
-    all_comments: list[ReviewComment] = []
-    all_metrics: list[AgentMetrics] = []
-
-    async def _bounded_analysis(
-        agent: ReviewAgent, file_change, context: PRDiff
-    ) -> tuple[list[ReviewComment], AgentMetrics]:
-        async with semaphore:
-            return await _run_agent_on_file(agent, file_change, context, timeout_per_agent)
-
-    # Build all tasks: agents × files
-    tasks = []
-    for file in pr_diff.files:
-        for agent in agents:
-            tasks.append(_bounded_analysis(agent, file, pr_diff))
+    limiter = rate_limiter or TokenBucketRateLimiter(max_concurrent=max_concurrent)
+    aggregator = CommentAggregator()
+
+    # One task per (file batch, agent)
+    batch_size = max(1, files_per_request)
+    batches = [
+        pr_diff.files[i : i + batch_size] for i in range(0, len(pr_diff.files), batch_size)
+    ]
+    pairs = [(batch, agent) for batch in batches for agent in agents]
+
+    # Metrics are kept in task order regardless of completion order
+    metrics_by_task: list[AgentMetrics | None] = [None] * len(pairs)
+
+    # First analysis of each (agent, batch content); identical batches await it
+    analyses: dict[tuple[str, bytes], asyncio.Future[_SharedAnalysis | None]] = {}
+
+    async def _paced_analysis(agent: ReviewAgent, files: list[FileChange]) -> _Analysis:
+        # Reserve the prompt and the completion budget up front so calls are
+        # paced here instead of being rejected by the provider's RPM/TPM limits.
+        # A character-based prompt estimate is enough for pacing; the reply
+        # reports the exact usage, and the rest of the reservation is returned.
+        messages = agent.build_batch_messages(files, pr_diff)
+        prompt_tokens = sum(llm.estimate_tokens(m["content"]) for m in messages)
+        async with limiter.slot(
+            estimated_tokens=prompt_tokens + max_completion_tokens
+        ) as reservation:
+            result = await _run_agent_on_files(
+                agent, files, pr_diff, timeout_per_agent, messages
+            )
+            metrics = result[1]
+            # Failed or timed-out requests keep their whole reservation
+            if metrics.error is None:
+                reservation.used = metrics.prompt_tokens + metrics.completion_tokens
+            return result
+
+    async def _analysis(agent: ReviewAgent, files: list[FileChange]) -> _Analysis:
+        # Identical patches (copies, renames, repeated boilerplate) are sent once per agent
+        key = (agent.name, _content_key(files))
+        shared = analyses.get(key)
+        if shared is not None:
+            reused = await shared
+            if reused is None:
+                return await _paced_analysis(agent, files)
+            logger.debug("analysis_reused", agent=agent.name, files=[f.filename for f in files])
+            return _reuse_analysis(*reused, files)
+
+        analyses[key] = shared = asyncio.get_running_loop().create_future()
+        result: _Analysis | None = None
+        try:
+            result = await _paced_analysis(agent, files)
+            return result
+        finally:
+            # Failed analyses are not shared; duplicates then run their own
+            ok = result is not None and result[1].error is None
+            shared.set_result((files, result) if ok else None)
+
+    async def _bounded_analysis(index: int, agent: ReviewAgent, files: list[FileChange]) -> None:
+        try:
+            comments, metrics = await _analysis(agent, files)
+        except Exception as e:
+            # A failed task only loses its own result
+            logger.error("task_exception", agent=agent.name, error=str(e))
+            return
+        # Fold each result in as it completes, deduplicating while slower tasks run
+        aggregator.add(comments, index)
+        metrics_by_task[index] = metrics
 
     logger.info(
         "pipeline_started",
         files=len(pr_diff.files),
         agents=len(agents),
-        total_tasks=len(tasks),
+        files_per_request=batch_size,
+        total_tasks=len(pairs),
     )
 
-    # Execute all with return_exceptions for fault tolerance
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    for result in results:
-        if isinstance(result, Exception):
-            logger.error("task_exception", error=str(result))
-            continue
-        comments, metrics = result
-        all_comments.extend(comments)
-        all_metrics.append(metrics)
+    # The task group cancels outstanding tasks if the review itself is cancelled
+    async with asyncio.TaskGroup() as tg:
+        for index, (batch, agent) in enumerate(pairs):
+            tg.create_task(_bounded_analysis(index, agent, batch))
 
-    # Aggregate
-    ranked_comments, risk_score = aggregate_comments(all_comments)
+    all_metrics = [m for m in metrics_by_task if m is not None]
+    ranked_comments, risk_score = aggregator.result()
 
-    total_ms = (time.perf_counter_ns() // 1_000_000) - start_ms
+    total_ms = int((time.monotonic() - start) * 1000)
 
     logger.info(
         "pipeline_complete",
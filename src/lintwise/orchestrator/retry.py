@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import random
 from collections.abc import Callable, Coroutine
 from typing import Any, TypeVar
 
@@ -25,11 +26,15 @@ async def retry_with_backoff(
 ) -> T:
     """Execute an async function with exponential backoff retry.
 
+    Uses "full jitter": each delay is drawn uniformly from zero up to the
+    exponential cap, so callers that fail together (e.g. agents hitting the
+    same rate limit) do not retry in lockstep.
+
     Args:
         func: Async callable to execute.
         max_retries: Maximum number of retries (not counting the initial attempt).
         base_delay: Base delay in seconds.
-        max_delay: Maximum delay between retries.
+        max_delay: Upper bound on the delay cap between retries.
         retryable_exceptions: Tuple of exception types that trigger a retry.
 
     Returns:
@@ -54,7 +59,8 @@ async def retry_with_backoff(
                 )
                 raise
 
-            delay = min(base_delay * (2 ** attempt), max_delay)
+            # Full jitter only spreads retries out; it needs no cryptographic randomness
+            delay = random.uniform(0, min(base_delay * (1 << attempt), max_delay))  # noqa: S311
             logger.warning(
                 "retrying",
                 function=func.__name__,
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import sys
+from typing import Any
+
 import pytest
 
 from lintwise.core.models import (
@@ -17,8 +20,21 @@ from lintwise.core.models import (
     Severity,
 )
 
+if sys.platform != "win32":
+    # uvloop ships with uvicorn[standard] everywhere but Windows
+    import uvloop
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config: pytest.Config, item: pytest.Item) -> dict[str, Any]:
+        """Run async tests on uvloop, as the server does."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+# The sample models are built once per session and shared between tests, so
+# treat them as read-only; use model_copy(update=...) to vary one.
+
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_hunk() -> HunkRange:
     return HunkRange(
         start_line=10,
@@ -27,7 +43,7 @@ def sample_hunk() -> HunkRange:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_file_change(sample_hunk: HunkRange) -> FileChange:
     return FileChange(
         filename="src/utils.py",
@@ -40,7 +56,7 @@ def sample_file_change(sample_hunk: HunkRange) -> FileChange:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_added_file() -> FileChange:
     return FileChange(
         filename="src/new_module.py",
@@ -52,7 +68,7 @@ def sample_added_file() -> FileChange:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_deleted_file() -> FileChange:
     return FileChange(
         filename="old_module.py",
@@ -64,7 +80,7 @@ def sample_deleted_file() -> FileChange:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pr_diff(sample_file_change: FileChange, sample_added_file: FileChange) -> PRDiff:
     return PRDiff(
         repo_owner="testorg",
@@ -79,7 +95,7 @@ def sample_pr_diff(sample_file_change: FileChange, sample_added_file: FileChange
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_review_comment() -> ReviewComment:
     return ReviewComment(
         file="src/utils.py",
@@ -94,7 +110,7 @@ def sample_review_comment() -> ReviewComment:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_agent_metrics() -> AgentMetrics:
     return AgentMetrics(
         agent_name="logic_agent",
@@ -106,7 +122,7 @@ def sample_agent_metrics() -> AgentMetrics:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_review_result(
     sample_pr_diff: PRDiff,
     sample_review_comment: ReviewComment,
@@ -7,7 +7,12 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from lintwise.agents.base import ReviewAgent
+from lintwise.agents.base import (
+    BATCH_FINDINGS_RESPONSE_FORMAT,
+    FINDINGS_RESPONSE_FORMAT,
+    PROMPT_CACHE_MIN_TOKENS,
+    ReviewAgent,
+)
 from lintwise.agents.logic_agent import LogicAgent
 from lintwise.agents.performance_agent import PerformanceAgent
 from lintwise.agents.readability_agent import ReadabilityAgent
@@ -35,20 +40,20 @@ class MockLLM(LLMProvider):
     """Test LLM that returns a configurable response."""
 
     def __init__(self, findings: list[dict] | None = None, error: Exception | None = None):
-        self._findings = findings or []
         self._error = error
-
-    async def complete(self, messages, **kwargs) -> LLMResponse:
-        if self._error:
-            raise self._error
-        content = json.dumps({"findings": self._findings})
-        return LLMResponse(
-            content=content,
+        # Built once; agents only read the response
+        self._response = LLMResponse(
+            content=json.dumps({"findings": findings or []}),
             prompt_tokens=100,
             completion_tokens=50,
             model="mock-model",
         )
 
+    async def complete(self, messages, **kwargs) -> LLMResponse:
+        if self._error:
+            raise self._error
+        return self._response
+
     async def count_tokens(self, text: str) -> int:
         return len(text.split())
 
@@ -62,7 +67,11 @@ class MockLLM(LLMProvider):
 SAMPLE_FILE = FileChange(
     filename="src/auth.py",
     status=FileStatus.MODIFIED,
-    patch="@@ -10,5 +10,7 @@\n-    password = request.args['pw']\n+    password = request.form.get('password')\n",
+    patch=(
+        "@@ -10,5 +10,7 @@\n"
+        "-    password = request.args['pw']\n"
+        "+    password = request.form.get('password')\n"
+    ),
     additions=1,
     deletions=1,
     language="python",
@@ -146,7 +155,13 @@ class TestReviewAgentBase:
         """LLM returns a bare JSON array instead of {findings: [...]}."""
         mock = AsyncMock(spec=LLMProvider)
         mock.complete.return_value = LLMResponse(
-            content=json.dumps([{"title": "Issue", "body": "Desc", "line": 5, "severity": "suggestion", "confidence": 0.7}]),
+            content=json.dumps([{
+                "title": "Issue",
+                "body": "Desc",
+                "line": 5,
+                "severity": "suggestion",
+                "confidence": 0.7,
+            }]),
             prompt_tokens=50,
             completion_tokens=20,
         )
@@ -154,6 +169,31 @@ class TestReviewAgentBase:
         comments, _ = await agent.analyze(SAMPLE_FILE, SAMPLE_PR)
         assert len(comments) == 1
 
+    @pytest.mark.asyncio
+    async def test_requests_structured_output(self):
+        mock = AsyncMock(spec=LLMProvider)
+        mock.complete.return_value = LLMResponse(content=json.dumps({"findings": SAMPLE_FINDINGS}))
+        agent = LogicAgent(mock)
+        comments, _ = await agent.analyze(SAMPLE_FILE, SAMPLE_PR)
+
+        assert len(comments) == 2
+        response_format = mock.complete.call_args.kwargs["response_format"]
+        assert response_format is FINDINGS_RESPONSE_FORMAT
+        assert response_format["json_schema"]["strict"] is True
+        item_schema = response_format["json_schema"]["schema"]["properties"]["findings"]["items"]
+        assert set(item_schema["required"]) == set(item_schema["properties"])
+        assert item_schema["properties"]["severity"]["enum"] == [s.value for s in Severity]
+
+    @pytest.mark.asyncio
+    async def test_parse_invalid_json(self):
+        """Non-JSON output is reported as an agent error, not raised."""
+        mock = AsyncMock(spec=LLMProvider)
+        mock.complete.return_value = LLMResponse(content="not json {")
+        agent = LogicAgent(mock)
+        comments, metrics = await agent.analyze(SAMPLE_FILE, SAMPLE_PR)
+        assert comments == []
+        assert "Invalid JSON" in metrics.error
+
     @pytest.mark.asyncio
     async def test_parse_malformed_item_skipped(self):
         """Malformed items in the array should be skipped, not crash."""
@@ -166,6 +206,34 @@ class TestReviewAgentBase:
         comments, _ = await agent.analyze(SAMPLE_FILE, SAMPLE_PR)
         assert len(comments) == 2
 
+    def test_parse_alternate_wrapper_keys(self):
+        agent = LogicAgent(MockLLM())
+        item = {"title": "T", "body": "B"}
+        assert len(agent._parse_response(json.dumps({"issues": [item]}), "a.py")) == 1
+        assert len(agent._parse_response(json.dumps({"comments": [item]}), "a.py")) == 1
+        assert agent._parse_response(json.dumps({"other": [item]}), "a.py") == []
+        assert agent._parse_response("42", "a.py") == []
+        both = json.dumps({"issues": [item, item], "findings": [item]})
+        assert len(agent._parse_response(both, "a.py")) == 1
+
+    def test_parse_applies_defaults_and_validates(self):
+        agent = LogicAgent(MockLLM())
+        content = json.dumps({"findings": [
+            {},
+            {"title": "Stringly", "confidence": "0.9"},
+            {"title": "Out of range", "confidence": 2.0},
+            {"title": "Bad severity", "severity": "blocker"},
+        ]})
+        comments = agent._parse_response(content, "a.py")
+
+        assert len(comments) == 2
+        assert comments[0].title == "Untitled finding"
+        assert comments[0].severity == Severity.SUGGESTION
+        assert comments[0].confidence == 0.7
+        assert comments[0].line is None
+        assert comments[1].confidence == 0.9
+        assert all(c.file == "a.py" and c.agent_name == "logic_agent" for c in comments)
+
     def test_system_prompt_content(self):
         llm = MockLLM()
         agent = LogicAgent(llm)
@@ -174,6 +242,124 @@ class TestReviewAgentBase:
         assert "JSON" in prompt
         assert "findings" in prompt.lower() or "array" in prompt.lower()
 
+    @pytest.mark.asyncio
+    async def test_analyze_batch_single_request(self):
+        other = SAMPLE_FILE.model_copy(update={"filename": "src/other.py"})
+        mock = AsyncMock(spec=LLMProvider)
+        mock.complete.return_value = LLMResponse(
+            content=json.dumps({"findings": [
+                {**SAMPLE_FINDINGS[0], "file_index": 2},
+                {**SAMPLE_FINDINGS[1], "file_index": 1},
+                {**SAMPLE_FINDINGS[1], "file_index": 3},  # No such file
+                {**SAMPLE_FINDINGS[1]},  # No index
+            ]}),
+            prompt_tokens=120,
+        )
+        agent = LogicAgent(mock)
+        comments, metrics = await agent.analyze_batch([SAMPLE_FILE, other], SAMPLE_PR)
+
+        mock.complete.assert_awaited_once()
+        kwargs = mock.complete.call_args.kwargs
+        assert kwargs["response_format"] is BATCH_FINDINGS_RESPONSE_FORMAT
+        prompt = kwargs["messages"][-1]["content"]
+        assert "## File 1: `src/auth.py`" in prompt
+        assert "## File 2: `src/other.py`" in prompt
+        assert kwargs["messages"][-2]["content"] == agent.build_context_prompt(SAMPLE_PR)
+
+        assert [(c.file, c.title) for c in comments] == [
+            ("src/other.py", "Missing null check"),
+            ("src/auth.py", "Log sensitive data"),
+        ]
+        assert metrics.files_analyzed == 2
+        assert metrics.comments_produced == 2
+        assert metrics.prompt_tokens == 120
+
+    @pytest.mark.asyncio
+    async def test_analyze_batch_of_one_uses_single_file_prompt(self):
+        mock = AsyncMock(spec=LLMProvider)
+        mock.complete.return_value = LLMResponse(content=json.dumps({"findings": SAMPLE_FINDINGS}))
+        agent = LogicAgent(mock)
+        comments, metrics = await agent.analyze_batch([SAMPLE_FILE], SAMPLE_PR)
+
+        kwargs = mock.complete.call_args.kwargs
+        assert kwargs["response_format"] is FINDINGS_RESPONSE_FORMAT
+        assert kwargs["messages"] == agent.build_messages(SAMPLE_FILE, SAMPLE_PR)
+        assert len(comments) == 2
+        assert metrics.files_analyzed == 1
+
+    @pytest.mark.asyncio
+    async def test_analyze_batch_sends_prebuilt_messages(self):
+        mock = AsyncMock(spec=LLMProvider)
+        mock.complete.return_value = LLMResponse(content=json.dumps({"findings": []}))
+        agent = LogicAgent(mock)
+        messages = agent.build_batch_messages([SAMPLE_FILE], SAMPLE_PR)
+
+        await agent.analyze_batch([SAMPLE_FILE], SAMPLE_PR, messages)
+
+        assert mock.complete.call_args.kwargs["messages"] is messages
+
+    def test_agent_requires_focus_prompt(self):
+        class NoFocusAgent(ReviewAgent):
+            name = "no_focus_agent"
+
+        with pytest.raises(TypeError, match="focus_prompt"):
+            NoFocusAgent(MockLLM())
+
+    def test_batch_response_format_adds_file_index(self):
+        def _item_schema(response_format):
+            return response_format["json_schema"]["schema"]["properties"]["findings"]["items"]
+
+        item_schema = _item_schema(BATCH_FINDINGS_RESPONSE_FORMAT)
+        single = _item_schema(FINDINGS_RESPONSE_FORMAT)
+        assert item_schema["required"] == [*single["required"], "file_index"]
+        assert item_schema["properties"]["file_index"] == {"type": "integer"}
+
+    def test_system_prompt_cached(self):
+        a, b = LogicAgent(MockLLM()), LogicAgent(MockLLM())
+        assert a.get_system_prompt() is b.get_system_prompt()
+        assert "security" in SecurityAgent(MockLLM()).get_system_prompt()
+
+    def test_messages_share_static_prefix(self):
+        """System + focus messages must be identical across files for prompt caching."""
+        other = SAMPLE_FILE.model_copy(update={"filename": "src/other.py"})
+        agent = SecurityAgent(MockLLM())
+        first = agent.build_messages(SAMPLE_FILE, SAMPLE_PR)
+        second = agent.build_messages(other, SAMPLE_PR)
+
+        assert [m["role"] for m in first] == ["system", "user", "system", "user"]
+        assert first[:3] == second[:3]
+        assert first[0] is second[0] and first[1] is second[1]
+        assert first[1]["content"] == agent.focus_prompt
+        assert SAMPLE_PR.title in first[2]["content"]
+        assert SAMPLE_FILE.filename in first[3]["content"]
+        assert "src/other.py" in second[3]["content"]
+
+    def test_static_prefix_long_enough_to_cache(self):
+        """System + focus prompts must exceed the provider's caching threshold (~4 chars/token)."""
+        for agent in create_all_agents(MockLLM()):
+            prefix = agent.get_system_prompt() + agent.focus_prompt
+            assert len(prefix) >= 4 * PROMPT_CACHE_MIN_TOKENS
+
+    @pytest.mark.asyncio
+    async def test_analysis_does_not_tokenize(self):
+        """The request is sent as-is; nothing counts tokens on the analysis path."""
+        mock = AsyncMock(spec=LLMProvider)
+        mock.complete.return_value = LLMResponse(content=json.dumps({"findings": []}))
+        agent = LogicAgent(mock)
+        await agent.analyze(SAMPLE_FILE, SAMPLE_PR)
+        await agent.analyze_batch([SAMPLE_FILE, SAMPLE_FILE], SAMPLE_PR)
+
+        mock.count_tokens.assert_not_awaited()
+        mock.count_tokens_batch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_forwards_cache_routing_user(self):
+        mock = AsyncMock(spec=LLMProvider)
+        mock.complete.return_value = LLMResponse(content=json.dumps({"findings": []}))
+        agent = SecurityAgent(mock)
+        await agent.analyze(SAMPLE_FILE, SAMPLE_PR)
+        assert mock.complete.call_args.kwargs["user"] == agent.name
+
 
 # ── Specialized Agents ──────────────────────────────────────────────────────
 
@@ -201,24 +387,24 @@ class TestSpecializedAgents:
 
     def test_logic_prompt_contains_focus_areas(self):
         agent = LogicAgent(MockLLM())
-        prompt = agent.build_prompt(SAMPLE_FILE, SAMPLE_PR)
+        prompt = agent.focus_prompt
         assert "null" in prompt.lower() or "dereference" in prompt.lower()
-        assert SAMPLE_FILE.filename in prompt
+        assert SAMPLE_FILE.filename in agent.build_prompt(SAMPLE_FILE, SAMPLE_PR)
 
     def test_readability_prompt_focus(self):
         agent = ReadabilityAgent(MockLLM())
-        prompt = agent.build_prompt(SAMPLE_FILE, SAMPLE_PR)
+        prompt = agent.focus_prompt
         assert "readability" in prompt.lower()
         assert "naming" in prompt.lower() or "complexity" in prompt.lower()
 
     def test_performance_prompt_focus(self):
         agent = PerformanceAgent(MockLLM())
-        prompt = agent.build_prompt(SAMPLE_FILE, SAMPLE_PR)
+        prompt = agent.focus_prompt
         assert "performance" in prompt.lower()
 
     def test_security_prompt_focus(self):
         agent = SecurityAgent(MockLLM())
-        prompt = agent.build_prompt(SAMPLE_FILE, SAMPLE_PR)
+        prompt = agent.focus_prompt
         assert "security" in prompt.lower() or "vulnerabilit" in prompt.lower()
 
     def test_prompts_include_pr_context(self):
@@ -230,10 +416,18 @@ class TestSpecializedAgents:
             SecurityAgent(MockLLM()),
         ]
         for agent in agents:
-            prompt = agent.build_prompt(SAMPLE_FILE, SAMPLE_PR)
+            prompt = "\n".join(m["content"] for m in agent.build_messages(SAMPLE_FILE, SAMPLE_PR))
             assert SAMPLE_PR.title in prompt
             assert SAMPLE_FILE.filename in prompt
 
+    def test_prompt_keeps_braces_in_user_content(self):
+        """Template placeholders must not be expanded inside the diff or title."""
+        fc = SAMPLE_FILE.model_copy(update={"patch": "+d = {'k': '{title}'}\n"})
+        pr = SAMPLE_PR.model_copy(update={"title": "Use {braces}"})
+        agent = LogicAgent(MockLLM())
+        assert "+d = {'k': '{title}'}" in agent.build_prompt(fc, pr)
+        assert "Use {braces}" in agent.build_context_prompt(pr)
+
     @pytest.mark.asyncio
     async def test_all_agents_produce_correct_category(self):
         """Each agent should tag its comments with the right category."""
@@ -287,6 +481,13 @@ class TestAgentRegistry:
         agents = create_agents_by_name(llm, names=["unknown_agent"])
         assert len(agents) == 0
 
+    def test_create_agents_by_name_order_and_duplicates(self):
+        llm = MockLLM()
+        agents = create_agents_by_name(
+            llm, names=["security_agent", "logic_agent", "security_agent"]
+        )
+        assert [a.name for a in agents] == ["security_agent", "logic_agent"]
+
     def test_get_agent_names(self):
         names = get_agent_names()
         assert len(names) == 4
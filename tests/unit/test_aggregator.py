@@ -6,12 +6,24 @@ import pytest
 
 from lintwise.core.models import ReviewCategory, ReviewComment, RiskScore, Severity
 from lintwise.orchestrator.aggregator import (
+    CommentAggregator,
     aggregate_comments,
     compute_risk_score,
     deduplicate_comments,
     rank_comments,
 )
 
+_PROTOTYPE = ReviewComment(
+    file="test.py",
+    line=10,
+    severity=Severity.WARNING,
+    category=ReviewCategory.LOGIC,
+    title="Issue",
+    body="Description of the issue.",
+    confidence=0.8,
+    agent_name="test_agent",
+)
+
 
 def _comment(
     file: str = "test.py",
@@ -22,16 +34,16 @@ def _comment(
     category: str = "logic",
     agent: str = "test_agent",
 ) -> ReviewComment:
-    return ReviewComment(
-        file=file,
-        line=line,
-        severity=Severity(severity),
-        category=ReviewCategory(category),
-        title=title,
-        body="Description of the issue.",
-        confidence=confidence,
-        agent_name=agent,
-    )
+    # Copy a validated prototype; the enums are still checked by their constructors
+    return _PROTOTYPE.model_copy(update={
+        "file": file,
+        "line": line,
+        "severity": Severity(severity),
+        "category": ReviewCategory(category),
+        "title": title,
+        "confidence": confidence,
+        "agent_name": agent,
+    })
 
 
 # ── Deduplication ───────────────────────────────────────────────────────────
@@ -63,6 +75,15 @@ class TestDeduplicateComments:
         result = deduplicate_comments(comments)
         assert len(result) == 1
 
+    def test_unicode_case_folded(self):
+        comments = [
+            _comment(title="Straße not validated", confidence=0.6),
+            _comment(title="STRASSE NOT VALIDATED ", confidence=0.7),
+        ]
+        result = deduplicate_comments(comments)
+        assert len(result) == 1
+        assert result[0].confidence == 0.7
+
     def test_different_files_not_deduped(self):
         comments = [
             _comment(file="a.py", title="Issue", line=10),
@@ -125,6 +146,22 @@ class TestRankComments:
     def test_empty(self):
         assert rank_comments([]) == []
 
+    @pytest.mark.parametrize("top_k", [0, 1, 3, 5, 20])
+    def test_top_k_matches_full_sort_prefix(self, top_k):
+        comments = [
+            _comment(severity=severity, confidence=confidence, title=f"{severity}-{confidence}-{i}")
+            for i, (severity, confidence) in enumerate(
+                [
+                    ("warning", 0.5),
+                    ("critical", 0.9),
+                    ("warning", 0.5),
+                    ("nitpick", 1.0),
+                    ("critical", 0.9),
+                ]
+            )
+        ]
+        assert rank_comments(comments, top_k) == rank_comments(comments)[:top_k]
+
 
 # ── Risk Score ──────────────────────────────────────────────────────────────
 
@@ -133,29 +170,23 @@ class TestComputeRiskScore:
     def test_no_comments_low(self):
         assert compute_risk_score([]) == RiskScore.LOW
 
-    def test_nitpicks_only_low(self):
-        comments = [_comment(severity="nitpick") for _ in range(10)]
-        assert compute_risk_score(comments) == RiskScore.LOW
-
-    def test_single_critical_medium(self):
-        # critical = 10 weight, threshold for medium is >5
-        comments = [_comment(severity="critical")]
-        assert compute_risk_score(comments) == RiskScore.MEDIUM
-
-    def test_multiple_warnings_medium(self):
-        # warning = 3, 3 warnings = 9 > 5 threshold
-        comments = [_comment(severity="warning") for _ in range(3)]
-        assert compute_risk_score(comments) == RiskScore.MEDIUM
-
-    def test_high_risk(self):
-        # Need >15: 2 critical (20) should be HIGH
-        comments = [_comment(severity="critical") for _ in range(2)]
-        assert compute_risk_score(comments) == RiskScore.HIGH
-
-    def test_critical_risk(self):
-        # Need >30: 4 critical (40)
-        comments = [_comment(severity="critical") for _ in range(4)]
-        assert compute_risk_score(comments) == RiskScore.CRITICAL
+    @pytest.mark.parametrize(
+        ("severity", "count", "expected"),
+        [
+            pytest.param("nitpick", 10, RiskScore.LOW, id="nitpicks_only_low"),
+            # critical = 10 weight, threshold for medium is >5
+            pytest.param("critical", 1, RiskScore.MEDIUM, id="single_critical_medium"),
+            # warning = 3, 3 warnings = 9 > 5 threshold
+            pytest.param("warning", 3, RiskScore.MEDIUM, id="multiple_warnings_medium"),
+            # Need >15: 2 critical (20) should be HIGH
+            pytest.param("critical", 2, RiskScore.HIGH, id="high_risk"),
+            # Need >30: 4 critical (40)
+            pytest.param("critical", 4, RiskScore.CRITICAL, id="critical_risk"),
+        ],
+    )
+    def test_uniform_severities(self, severity, count, expected):
+        comments = [_comment(severity=severity) for _ in range(count)]
+        assert compute_risk_score(comments) == expected
 
     def test_mixed_severities(self):
         comments = [
@@ -167,6 +198,29 @@ class TestComputeRiskScore:
         # Total: 14, which is > 5 (medium) but ≤ 15, so MEDIUM
         assert compute_risk_score(comments) == RiskScore.MEDIUM
 
+    @pytest.mark.parametrize(
+        ("weight", "expected"),
+        [
+            (0, RiskScore.LOW),
+            (5, RiskScore.LOW),
+            (6, RiskScore.MEDIUM),
+            (15, RiskScore.MEDIUM),
+            (16, RiskScore.HIGH),
+            (30, RiskScore.HIGH),
+            (31, RiskScore.CRITICAL),
+        ],
+    )
+    def test_threshold_boundaries(self, weight, expected):
+        # Each threshold is exclusive: a weight equal to it stays in the lower band
+        comments = [_comment(severity="suggestion") for _ in range(weight)]
+        assert compute_risk_score(comments) == expected
+
+    def test_enum_weights_mirror_constants(self):
+        from lintwise.core.constants import SEVERITY_WEIGHTS
+        from lintwise.orchestrator.aggregator import _SEVERITY_WEIGHT
+
+        assert {s.value: w for s, w in _SEVERITY_WEIGHT.items()} == SEVERITY_WEIGHTS
+
 
 # ── Full Aggregation ────────────────────────────────────────────────────────
 
@@ -187,3 +241,53 @@ class TestAggregateComments:
         ranked, risk = aggregate_comments([])
         assert ranked == []
         assert risk == RiskScore.LOW
+
+    def test_risk_uses_kept_duplicate_severity(self):
+        # The higher-confidence duplicate replaces the critical one, so only
+        # its warning weight counts towards the risk score.
+        comments = [
+            _comment(severity="critical", title="A", line=1, confidence=0.5),
+            _comment(severity="warning", title="A", line=1, confidence=0.9),
+        ]
+        ranked, risk = aggregate_comments(comments)
+        assert [c.severity for c in ranked] == [Severity.WARNING]
+        assert risk == compute_risk_score(ranked) == RiskScore.LOW
+
+    def test_top_k_limits_comments_not_risk(self):
+        comments = [_comment(severity="critical", title=f"C{i}", line=i) for i in range(4)]
+        ranked, risk = aggregate_comments(comments, top_k=1)
+        assert [c.title for c in ranked] == ["C0"]
+        assert risk == RiskScore.CRITICAL
+
+
+class TestCommentAggregator:
+    def test_out_of_order_batches_match_in_order(self):
+        batches = [
+            [
+                _comment(title="A", line=1, confidence=0.6),
+                _comment(title="B", line=2, severity="critical"),
+            ],
+            [
+                _comment(title="a", line=1, confidence=0.6, agent="second"),
+                _comment(title="C", line=3),
+            ],
+            [_comment(title="A", line=1, confidence=0.9, severity="nitpick", agent="third")],
+        ]
+        expected = aggregate_comments([c for batch in batches for c in batch])
+
+        aggregator = CommentAggregator()
+        for index in (2, 1, 0):
+            aggregator.add(batches[index], index)
+        assert aggregator.result() == expected
+
+    def test_equal_confidence_tie_goes_to_earliest_batch(self):
+        aggregator = CommentAggregator()
+        aggregator.add([_comment(agent="late")], 1)
+        aggregator.add([_comment(agent="early")], 0)
+        assert [c.agent_name for c in aggregator.deduplicated()] == ["early"]
+
+    def test_deduplicated_in_first_occurrence_order(self):
+        aggregator = CommentAggregator()
+        aggregator.add([_comment(title="Z", line=9)], 1)
+        aggregator.add([_comment(title="Y", line=1)], 0)
+        assert [c.title for c in aggregator.deduplicated()] == ["Y", "Z"]
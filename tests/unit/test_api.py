@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
+import hmac
 import json
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
 from lintwise.api.app import create_app
+from lintwise.api.dependencies import get_app_settings
+from lintwise.api.routers import reviews, webhooks
 from lintwise.api.schemas import (
     ErrorResponse,
     HealthResponse,
@@ -16,14 +21,38 @@ from lintwise.api.schemas import (
     ReviewRequest,
     ReviewResponse,
 )
+from lintwise.core.config import get_settings
+from lintwise.core.exceptions import (
+    GitHubAuthError,
+    GitHubError,
+    GitHubRateLimitError,
+    InvalidPRURLError,
+    LLMRateLimitError,
+    PRNotFoundError,
+    ValidationError,
+)
+from lintwise.llm import openai_provider
 
 
-@pytest.fixture
-def client():
-    app = create_app()
+@pytest.fixture(scope="module")
+def app():
+    """One app for the module; tests only send requests and never run the lifespan."""
+    return create_app()
+
+
+@pytest.fixture(scope="module")
+def client(app):
     return TestClient(app)
 
 
+@pytest.fixture
+async def asgi_client(app):
+    """Calls the app in-process over ASGI, without TestClient's thread portal."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
 # ── Schemas ─────────────────────────────────────────────────────────────────
 
 
@@ -114,22 +143,65 @@ class TestReviewEndpoints:
         )
         assert response.status_code == 503
 
+    def test_to_api_comments(self):
+        from lintwise.api.routers.reviews import _to_api_comments
+        from lintwise.core.models import ReviewCategory, ReviewComment, Severity
+
+        comment = ReviewComment(
+            file="a.py",
+            line=3,
+            severity=Severity.CRITICAL,
+            category=ReviewCategory.SECURITY,
+            title="SQL injection",
+            body="Unsafe query.",
+            confidence=0.9,
+            agent_name="security_agent",
+        )
+        [api] = _to_api_comments([comment])
+        assert api.model_dump() == {
+            "file": "a.py",
+            "line": 3,
+            "severity": "critical",
+            "category": "security",
+            "title": "SQL injection",
+            "body": "Unsafe query.",
+            "suggestion": None,
+            "confidence": 0.9,
+        }
+        assert type(api.severity) is str
+
+    def test_count_changes(self):
+        from lintwise.api.routers.reviews import _count_changes
+
+        diff = "+first\n context\n-old\n+new\n+another\n"
+        assert _count_changes(diff) == (3, 1)
+        assert _count_changes("-gone\n") == (0, 1)
+        assert _count_changes("") == (0, 0)
+
+    def test_count_changes_skips_file_headers(self):
+        from lintwise.api.routers.reviews import _count_changes
+
+        diff = "--- a/app.py\n+++ b/app.py\n@@ -1,2 +1,2 @@\n context\n-old\n+new\n"
+        assert _count_changes(diff) == (1, 1)
+
 
 # ── Webhook Endpoint ────────────────────────────────────────────────────────
 
 
 class TestWebhookEndpoint:
-    def test_invalid_json(self, client):
-        response = client.post(
+    @pytest.mark.asyncio
+    async def test_invalid_json(self, asgi_client):
+        response = await asgi_client.post(
             "/api/v1/webhooks/github",
             content=b"not json",
             headers={"X-GitHub-Event": "pull_request"},
         )
         assert response.status_code == 400
 
-    def test_non_actionable_event(self, client):
+    @pytest.mark.asyncio
+    async def test_non_actionable_event(self, asgi_client):
         payload = {"action": "created", "issue": {"number": 1}}
-        response = client.post(
+        response = await asgi_client.post(
             "/api/v1/webhooks/github",
             json=payload,
             headers={"X-GitHub-Event": "issues"},
@@ -138,7 +210,8 @@ class TestWebhookEndpoint:
         data = response.json()
         assert data["status"] == "ignored"
 
-    def test_pr_opened_event(self, client):
+    @pytest.mark.asyncio
+    async def test_pr_opened_event(self, asgi_client):
         payload = {
             "action": "opened",
             "pull_request": {
@@ -150,7 +223,7 @@ class TestWebhookEndpoint:
             "repository": {"full_name": "org/repo", "name": "repo"},
             "sender": {"login": "user"},
         }
-        response = client.post(
+        response = await asgi_client.post(
             "/api/v1/webhooks/github",
             json=payload,
             headers={"X-GitHub-Event": "pull_request"},
@@ -160,16 +233,130 @@ class TestWebhookEndpoint:
         assert data["status"] == "accepted"
         assert data["action"] == "opened"
 
+    @pytest.mark.asyncio
+    async def test_signature_checked_with_configured_secret(self, asgi_client, monkeypatch):
+        monkeypatch.setattr(webhooks, "_webhook_secret", b"whsec_test")
+        body = b'{"action": "created"}'
+        digest = hmac.new(b"whsec_test", body, hashlib.sha256).hexdigest()
+
+        for signature, expected in ((f"sha256={digest}", 202), ("sha256=" + "0" * 64, 401)):
+            response = await asgi_client.post(
+                "/api/v1/webhooks/github",
+                content=body,
+                headers={"X-GitHub-Event": "issues", "X-Hub-Signature-256": signature},
+            )
+            assert response.status_code == expected
+
+
+# ── Exception Handlers ──────────────────────────────────────────────────────
+
+
+class TestExceptionHandlers:
+    @pytest.mark.parametrize(
+        ("exc", "status", "error"),
+        [
+            (InvalidPRURLError("bad url"), 400, "Invalid PR URL"),
+            (ValidationError("bad input"), 422, "Validation Error"),
+            (GitHubAuthError("bad token"), 401, "GitHub Auth Error"),
+            (PRNotFoundError("no pr"), 404, "PR Not Found"),
+            (GitHubRateLimitError(reset_at=1), 429, "Rate Limited"),
+            (LLMRateLimitError("slow down"), 502, "LLM Error"),
+            (GitHubError("boom"), 500, "Internal Error"),
+        ],
+    )
+    def test_domain_errors_mapped(self, exc, status, error):
+        app = create_app()
+
+        @app.get("/raise")
+        async def _raise():
+            raise exc
+
+        response = TestClient(app).get("/raise")
+        assert response.status_code == status
+        assert response.json() == {"error": error, "detail": str(exc)}
+
+
+# ── Lifespan ────────────────────────────────────────────────────────────────
+
+
+class TestLifespan:
+    @pytest.fixture(autouse=True)
+    def _isolate(self, monkeypatch):
+        """Restore router globals and the settings caches after each test."""
+        monkeypatch.setattr(reviews, "_github_client", None)
+        monkeypatch.setattr(reviews, "_llm_provider", None)
+        monkeypatch.setattr(reviews, "_rate_limiter", None)
+        monkeypatch.setattr(reviews, "_files_per_request", 1)
+        monkeypatch.setattr(reviews, "_max_completion_tokens", 4096)
+        monkeypatch.setattr(webhooks, "_webhook_secret", None)
+        get_app_settings.cache_clear()
+        get_settings.cache_clear()
+        yield
+        get_app_settings.cache_clear()
+        get_settings.cache_clear()
+
+    def test_configures_services_on_startup(self, monkeypatch):
+        monkeypatch.setenv("LINTWISE_GITHUB_TOKEN", "ghp_test")
+        monkeypatch.setenv("LINTWISE_OPENAI_API_KEY", "sk-test")
+        monkeypatch.setenv("LINTWISE_GITHUB_WEBHOOK_SECRET", "whsec_test")
+        monkeypatch.setattr(openai_provider, "_get_encoding", lambda model: None)
+
+        with TestClient(create_app()):
+            assert reviews._github_client is not None
+            assert reviews._llm_provider is not None
+            assert reviews._rate_limiter is not None
+            assert webhooks._webhook_secret == b"whsec_test"
+
+    def test_rate_limiter_uses_settings(self, monkeypatch):
+        monkeypatch.setenv("LINTWISE_GITHUB_TOKEN", "ghp_test")
+        monkeypatch.setenv("LINTWISE_OPENAI_API_KEY", "sk-test")
+        monkeypatch.setenv("LINTWISE_OPENAI_RPM", "30")
+        monkeypatch.setenv("LINTWISE_OPENAI_MAX_TOKENS", "2048")
+        monkeypatch.setattr(openai_provider, "_get_encoding", lambda model: None)
+
+        with TestClient(create_app()):
+            assert reviews._rate_limiter._rpm == 30
+            assert reviews._max_completion_tokens == 2048
+
+    def test_files_per_request_defaults_to_batches(self, monkeypatch):
+        monkeypatch.setenv("LINTWISE_GITHUB_TOKEN", "ghp_test")
+        monkeypatch.setenv("LINTWISE_OPENAI_API_KEY", "sk-test")
+        monkeypatch.setattr(openai_provider, "_get_encoding", lambda model: None)
+
+        with TestClient(create_app()):
+            assert reviews._files_per_request == 4
+
+    def test_starts_without_settings(self, monkeypatch):
+        monkeypatch.delenv("LINTWISE_GITHUB_TOKEN", raising=False)
+        monkeypatch.delenv("LINTWISE_OPENAI_API_KEY", raising=False)
+
+        with TestClient(create_app()) as client:
+            assert client.get("/api/v1/health").status_code == 200
+            response = client.post(
+                "/api/v1/reviews/",
+                json={"pr_url": "https://github.com/org/repo/pull/1"},
+            )
+            assert response.status_code == 503
+
 
 # ── OpenAPI Docs ────────────────────────────────────────────────────────────
 
 
+@pytest.fixture(scope="module")
+def openapi_response(client):
+    """The schema is built and fetched once; tests assert against the same response."""
+    return client.get("/openapi.json")
+
+
 class TestDocs:
-    def test_openapi_available(self, client):
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["info"]["title"] == "Lintwise"
+    def test_openapi_available(self, openapi_response):
+        assert openapi_response.status_code == 200
+        assert openapi_response.json()["info"]["title"] == "Lintwise"
+
+    def test_openapi_lists_review_endpoints(self, openapi_response):
+        paths = openapi_response.json()["paths"]
+        assert "/api/v1/reviews/" in paths
+        assert "/api/v1/reviews/manual" in paths
 
     def test_docs_page(self, client):
         response = client.get("/docs")
@@ -178,3 +365,12 @@ class TestDocs:
     def test_request_id_header(self, client):
         response = client.get("/api/v1/health")
         assert "x-request-id" in response.headers
+        request_id = response.headers["x-request-id"]
+        assert len(request_id) == 8
+        int(request_id, 16)  # hex
+
+    def test_request_id_on_error_responses(self, client):
+        first = client.get("/api/v1/does-not-exist")
+        second = client.get("/api/v1/does-not-exist")
+        assert first.status_code == 404
+        assert first.headers["x-request-id"] != second.headers["x-request-id"]
@@ -125,6 +125,7 @@ class TestBuildReviewBody:
         body = build_review_body(result)
         assert "1 critical" in body
         assert "1 warnings" in body
+        assert "🔵 0 suggestions | ⚪ 0 nitpicks" in body
 
     def test_empty_comments(self, pr_diff: PRDiff):
         result = ReviewResult(
@@ -195,3 +196,16 @@ class TestBuildReviewRequest:
         request = build_review_request(result)
         assert "CRITICAL Risk" in request.body
         assert "Security issue found." in request.body
+
+    def test_payload_dump(self, pr_diff: PRDiff, critical_comment: ReviewComment):
+        result = ReviewResult(pr_diff=pr_diff, comments=[critical_comment])
+        payload = build_review_request(result).model_dump(exclude_none=True)
+        assert payload["event"] == "COMMENT"
+        assert payload["comments"] == [
+            {
+                "path": "auth.py",
+                "line": 42,
+                "side": "RIGHT",
+                "body": format_inline_comment(critical_comment),
+            }
+        ]
@@ -135,7 +135,16 @@ class TestSettings:
 
 
 class TestGetSettings:
-    """Tests for the get_settings factory."""
+    """Tests for the get_settings factory.
+
+    get_settings is cached per process, so each test starts from a cleared cache.
+    """
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        get_settings.cache_clear()
+        yield
+        get_settings.cache_clear()
 
     def test_returns_settings_instance(self):
         with patch.dict(os.environ, VALID_ENV, clear=False):
@@ -146,3 +155,7 @@ class TestGetSettings:
         with patch.dict(os.environ, {}, clear=True):
             with pytest.raises(ValidationError):
                 get_settings()
+
+    def test_cached(self):
+        with patch.dict(os.environ, VALID_ENV, clear=False):
+            assert get_settings() is get_settings()
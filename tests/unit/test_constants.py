@@ -16,15 +16,21 @@ from lintwise.core.constants import (
 class TestExtensionLanguageMap:
     """Tests for the file extension → language mapping."""
 
-    def test_common_languages(self):
-        assert EXTENSION_LANGUAGE_MAP[".py"] == "python"
-        assert EXTENSION_LANGUAGE_MAP[".js"] == "javascript"
-        assert EXTENSION_LANGUAGE_MAP[".ts"] == "typescript"
-        assert EXTENSION_LANGUAGE_MAP[".java"] == "java"
-        assert EXTENSION_LANGUAGE_MAP[".go"] == "go"
-        assert EXTENSION_LANGUAGE_MAP[".rs"] == "rust"
-        assert EXTENSION_LANGUAGE_MAP[".rb"] == "ruby"
-        assert EXTENSION_LANGUAGE_MAP[".cs"] == "csharp"
+    @pytest.mark.parametrize(
+        ("ext", "language"),
+        [
+            (".py", "python"),
+            (".js", "javascript"),
+            (".ts", "typescript"),
+            (".java", "java"),
+            (".go", "go"),
+            (".rs", "rust"),
+            (".rb", "ruby"),
+            (".cs", "csharp"),
+        ],
+    )
+    def test_common_languages(self, ext, language):
+        assert EXTENSION_LANGUAGE_MAP[ext] == language
 
     def test_jsx_tsx_mappings(self):
         assert EXTENSION_LANGUAGE_MAP[".jsx"] == "javascript"
@@ -56,47 +62,30 @@ class TestExtensionLanguageMap:
 class TestDetectLanguage:
     """Tests for the detect_language function."""
 
-    def test_python(self):
-        assert detect_language("main.py") == "python"
-
-    def test_javascript(self):
-        assert detect_language("index.js") == "javascript"
-
-    def test_typescript(self):
-        assert detect_language("component.ts") == "typescript"
-
-    def test_tsx(self):
-        assert detect_language("App.tsx") == "typescript"
-
-    def test_unknown_extension(self):
-        assert detect_language("data.xyz") is None
-
-    def test_no_extension(self):
-        assert detect_language("Makefile") is None
-
-    def test_case_insensitive(self):
-        assert detect_language("Main.PY") == "python"
-        assert detect_language("INDEX.JS") == "javascript"
-
-    def test_path_with_directories(self):
-        assert detect_language("src/components/Button.tsx") == "typescript"
-        assert detect_language("pkg/handlers/auth.go") == "go"
-
-    def test_dotfile(self):
-        assert detect_language(".gitignore") is None
-
-    def test_dockerfile(self):
-        assert detect_language("app.dockerfile") == "dockerfile"
-
-    def test_markdown(self):
-        assert detect_language("README.md") == "markdown"
-
-    def test_shell(self):
-        assert detect_language("deploy.sh") == "shell"
-        assert detect_language("build.bash") == "shell"
-
-    def test_sql(self):
-        assert detect_language("migrations/001.sql") == "sql"
+    @pytest.mark.parametrize(
+        ("filename", "language"),
+        [
+            pytest.param("main.py", "python", id="python"),
+            pytest.param("index.js", "javascript", id="javascript"),
+            pytest.param("component.ts", "typescript", id="typescript"),
+            pytest.param("App.tsx", "typescript", id="tsx"),
+            pytest.param("data.xyz", None, id="unknown_extension"),
+            pytest.param("Makefile", None, id="no_extension"),
+            pytest.param("Main.PY", "python", id="case_insensitive"),
+            pytest.param("INDEX.JS", "javascript", id="case_insensitive_js"),
+            pytest.param("src/components/Button.tsx", "typescript", id="path_with_directories"),
+            pytest.param("pkg/handlers/auth.go", "go", id="path_with_directories_go"),
+            pytest.param(".gitignore", None, id="dotfile"),
+            pytest.param("app.dockerfile", "dockerfile", id="dockerfile"),
+            pytest.param("README.md", "markdown", id="markdown"),
+            pytest.param("deploy.sh", "shell", id="shell"),
+            pytest.param("build.bash", "shell", id="bash"),
+            pytest.param("config.d/Makefile", None, id="dot_in_directory_only"),
+            pytest.param("migrations/001.sql", "sql", id="sql"),
+        ],
+    )
+    def test_detect_language(self, filename, language):
+        assert detect_language(filename) == language
 
 
 class TestSkipPatterns:
@@ -5,7 +5,13 @@ from __future__ import annotations
 import pytest
 
 from lintwise.core.models import FileStatus
-from lintwise.github.diff_parser import parse_patch, parse_pr_files, should_skip_file
+from lintwise.github.diff_parser import (
+    count_marked_lines,
+    parse_patch,
+    parse_pr_files,
+    should_skip_file,
+)
+from lintwise.github.schemas import GitHubFile
 
 
 # ── Sample Patches ──────────────────────────────────────────────────────────
@@ -60,40 +66,81 @@ SINGLE_LINE_HUNK = """\
 """
 
 
+# ── Parsed Samples ──────────────────────────────────────────────────────────
+# Parsed once per session; tests only read the results.
+
+
+@pytest.fixture(scope="session")
+def simple_fc():
+    return parse_patch("src/utils.py", SIMPLE_PATCH, "modified")
+
+
+@pytest.fixture(scope="session")
+def multi_hunk_fc():
+    return parse_patch("main.py", MULTI_HUNK_PATCH, "modified")
+
+
+@pytest.fixture(scope="session")
+def addition_only_fc():
+    return parse_patch("new_file.py", ADDITION_ONLY_PATCH, "added")
+
+
+@pytest.fixture(scope="session")
+def single_line_fc():
+    return parse_patch("config.py", SINGLE_LINE_HUNK, "modified")
+
+
 # ── parse_patch ─────────────────────────────────────────────────────────────
 
 
 class TestParsePatch:
-    def test_simple_modification(self):
-        fc = parse_patch("src/utils.py", SIMPLE_PATCH, "modified")
-        assert fc.filename == "src/utils.py"
-        assert fc.status == FileStatus.MODIFIED
-        assert fc.additions == 2
+    def test_simple_modification(self, simple_fc):
+        assert simple_fc.filename == "src/utils.py"
+        assert simple_fc.status == FileStatus.MODIFIED
+        assert simple_fc.additions == 2
+        assert simple_fc.deletions == 1
+        assert simple_fc.language == "python"
+        assert len(simple_fc.hunks) == 1
+        assert simple_fc.hunks[0].start_line == 10
+
+    def test_multi_hunk(self, multi_hunk_fc):
+        assert len(multi_hunk_fc.hunks) == 2
+        assert multi_hunk_fc.hunks[0].start_line == 1
+        assert multi_hunk_fc.hunks[1].start_line == 21
+        assert multi_hunk_fc.additions == 2
+        assert multi_hunk_fc.deletions == 0
+
+    def test_multi_hunk_bodies(self, multi_hunk_fc):
+        assert multi_hunk_fc.hunks[0].content == "import os\n+import sys\n \n def a():"
+        assert multi_hunk_fc.hunks[1].content.startswith("pass")
+        assert multi_hunk_fc.hunks[1].content.endswith("return True")
+        assert "@@" not in multi_hunk_fc.hunks[0].content
+
+    def test_file_header_lines_not_counted(self):
+        patch = "--- a/x.py\n+++ b/x.py\n@@ -1 +1 @@\n-old\n+new\n"
+        fc = parse_patch("x.py", patch, "modified")
+        assert fc.additions == 1
         assert fc.deletions == 1
-        assert fc.language == "python"
-        assert len(fc.hunks) == 1
-        assert fc.hunks[0].start_line == 10
-
-    def test_multi_hunk(self):
-        fc = parse_patch("main.py", MULTI_HUNK_PATCH, "modified")
-        assert len(fc.hunks) == 2
-        assert fc.hunks[0].start_line == 1
-        assert fc.hunks[1].start_line == 21
-        assert fc.additions == 2
-        assert fc.deletions == 0
-
-    def test_addition_only(self):
-        fc = parse_patch("new_file.py", ADDITION_ONLY_PATCH, "added")
-        assert fc.status == FileStatus.ADDED
-        assert fc.additions == 5
-        assert fc.deletions == 0
-        assert len(fc.hunks) == 1
-        assert fc.hunks[0].start_line == 1
 
-    def test_deletion_remap(self):
-        """GitHub uses 'removed', our model uses 'deleted'."""
-        fc = parse_patch("old.py", DELETION_ONLY_PATCH, "removed")
-        assert fc.status == FileStatus.DELETED
+    def test_addition_only(self, addition_only_fc):
+        assert addition_only_fc.status == FileStatus.ADDED
+        assert addition_only_fc.additions == 5
+        assert addition_only_fc.deletions == 0
+        assert len(addition_only_fc.hunks) == 1
+        assert addition_only_fc.hunks[0].start_line == 1
+
+    @pytest.mark.parametrize(
+        ("github_status", "expected"),
+        [
+            ("added", FileStatus.ADDED),
+            ("modified", FileStatus.MODIFIED),
+            ("removed", FileStatus.DELETED),  # GitHub uses 'removed', our model uses 'deleted'
+            ("renamed", FileStatus.RENAMED),
+        ],
+        ids=["added", "modified", "removed-remapped", "renamed"],
+    )
+    def test_status_mapping(self, github_status, expected):
+        assert parse_patch("old.py", DELETION_ONLY_PATCH, github_status).status == expected
 
     def test_empty_patch(self):
         fc = parse_patch("binary.png", "", "modified")
@@ -102,65 +149,116 @@ class TestParsePatch:
         assert fc.hunks == []
         assert fc.patch == ""
 
-    def test_language_detection(self):
-        assert parse_patch("app.js", SIMPLE_PATCH).language == "javascript"
-        assert parse_patch("main.go", SIMPLE_PATCH).language == "go"
-        assert parse_patch("Dockerfile", SIMPLE_PATCH).language is None
-
-    def test_single_line_hunk(self):
-        fc = parse_patch("config.py", SINGLE_LINE_HUNK, "modified")
-        assert len(fc.hunks) == 1
-        assert fc.hunks[0].start_line == 5
-        assert fc.additions == 1
-        assert fc.deletions == 1
-
-    def test_patch_content_preserved(self):
-        fc = parse_patch("test.py", SIMPLE_PATCH, "modified")
-        assert fc.patch == SIMPLE_PATCH
-
-    def test_renamed_status(self):
-        fc = parse_patch("new_name.py", SIMPLE_PATCH, "renamed")
-        assert fc.status == FileStatus.RENAMED
+    @pytest.mark.parametrize(
+        "patch",
+        ["+a\n-b", "Binary files differ"],
+        ids=["no-hunk-header", "binary-notice"],
+    )
+    def test_patch_without_hunk_header(self, patch):
+        fc = parse_patch("f.py", patch, "modified")
+        assert fc.hunks == []
+        assert fc.patch == patch
+
+    def test_patch_without_hunk_header_counts_lines(self):
+        fc = parse_patch("f.py", "+a\n-b", "modified")
+        assert (fc.additions, fc.deletions) == (1, 1)
+
+    @pytest.mark.parametrize(
+        ("filename", "language"),
+        [
+            ("app.js", "javascript"),
+            ("main.go", "go"),
+            ("Dockerfile", None),
+        ],
+        ids=["javascript", "go", "unknown"],
+    )
+    def test_language_detection(self, filename, language):
+        assert parse_patch(filename, SIMPLE_PATCH).language == language
+
+    def test_single_line_hunk(self, single_line_fc):
+        assert len(single_line_fc.hunks) == 1
+        assert single_line_fc.hunks[0].start_line == 5
+        assert single_line_fc.additions == 1
+        assert single_line_fc.deletions == 1
+
+    def test_patch_content_preserved(self, simple_fc):
+        assert simple_fc.patch == SIMPLE_PATCH
+
+    def test_unknown_status_rejected(self):
+        with pytest.raises(ValueError):
+            parse_patch("copy.py", SIMPLE_PATCH, "copied")
+
+    def test_result_round_trips_through_validation(self, multi_hunk_fc):
+        assert type(multi_hunk_fc).model_validate(multi_hunk_fc.model_dump()) == multi_hunk_fc
+
+
+class TestCountMarkedLines:
+    @pytest.mark.parametrize(
+        ("patch", "marker", "expected"),
+        [
+            ("+a\n+b\n-c", "+", 2),
+            ("+a\n+b\n-c", "-", 1),
+            ("--- a/x.py\n+++ b/x.py\n@@ -1 +1 @@\n-old\n+new\n", "+", 1),
+            ("--- a/x.py\n+++ b/x.py\n@@ -1 +1 @@\n-old\n+new\n", "-", 1),
+            ("", "+", 0),
+        ],
+        ids=["additions", "deletions", "header-plus", "header-minus", "empty"],
+    )
+    def test_counts(self, patch, marker, expected):
+        assert count_marked_lines(patch, marker) == expected
 
 
 # ── should_skip_file ────────────────────────────────────────────────────────
 
 
-class TestShouldSkipFile:
-    def test_lockfiles_skipped(self):
-        assert should_skip_file("package-lock.json") is True
-        assert should_skip_file("yarn.lock") is True
-        assert should_skip_file("poetry.lock") is True
+# (path, expected)
+_SKIP_CASES = (
+    ("package-lock.json", True),
+    ("yarn.lock", True),
+    ("poetry.lock", True),
+    (".gitignore", True),
+    ("LICENSE", True),
+    ("main.py", False),
+    ("index.js", False),
+    ("README.md", False),
+    # Nested paths are judged by their basename
+    ("frontend/package-lock.json", True),
+    ("src/main.py", False),
+)
 
-    def test_source_files_not_skipped(self):
-        assert should_skip_file("main.py") is False
-        assert should_skip_file("index.js") is False
-        assert should_skip_file("README.md") is False
 
-    def test_nested_path_uses_basename(self):
-        assert should_skip_file("frontend/package-lock.json") is True
-        assert should_skip_file("src/main.py") is False
-
-    def test_gitignore_skipped(self):
-        assert should_skip_file(".gitignore") is True
-
-    def test_license_skipped(self):
-        assert should_skip_file("LICENSE") is True
+class TestShouldSkipFile:
+    @pytest.mark.parametrize(("path", "expected"), _SKIP_CASES)
+    def test_skip(self, path, expected):
+        assert should_skip_file(path) is expected
 
 
 # ── parse_pr_files ──────────────────────────────────────────────────────────
 
+# Identical modified files named file_0.py … file_99.py; parse_pr_files only reads them
+_BULK_FILES = [
+    GitHubFile(
+        filename=f"file_{i}.py",
+        status="modified",
+        additions=2,
+        deletions=1,
+        changes=3,
+        patch=SIMPLE_PATCH,
+    )
+    for i in range(100)
+]
+
 
 class TestParsePRFiles:
     def _make_file(self, filename: str, patch: str = SIMPLE_PATCH, status: str = "modified"):
-        return {
-            "filename": filename,
-            "status": status,
-            "additions": 2,
-            "deletions": 1,
-            "changes": 3,
-            "patch": patch,
-        }
+        return GitHubFile(
+            filename=filename,
+            status=status,
+            additions=2,
+            deletions=1,
+            changes=3,
+            patch=patch,
+        )
 
     def test_basic_parsing(self):
         files = [self._make_file("main.py"), self._make_file("utils.py")]
@@ -180,7 +278,7 @@ class TestParsePRFiles:
     def test_skips_no_patch(self):
         files = [
             self._make_file("main.py"),
-            {"filename": "image.png", "status": "added", "patch": None},
+            GitHubFile(filename="image.png", status="added", patch=None),
         ]
         parsed, skipped = parse_pr_files(files)
         assert len(parsed) == 1
@@ -189,23 +287,38 @@ class TestParsePRFiles:
     def test_skips_empty_patch(self):
         files = [
             self._make_file("main.py"),
-            {"filename": "empty.py", "status": "modified", "patch": ""},
+            GitHubFile(filename="empty.py", status="modified", patch=""),
         ]
         parsed, skipped = parse_pr_files(files)
         assert len(parsed) == 1
         assert "empty.py" in skipped
 
     def test_max_files_limit(self):
-        files = [self._make_file(f"file_{i}.py") for i in range(100)]
-        parsed, skipped = parse_pr_files(files, max_files=5)
+        parsed, skipped = parse_pr_files(_BULK_FILES, max_files=5)
         assert len(parsed) == 5
 
     def test_max_lines_limit(self):
-        # Each patch has ~6 lines; with limit of 10, only 1-2 files should fit
-        files = [self._make_file(f"file_{i}.py") for i in range(10)]
-        parsed, skipped = parse_pr_files(files, max_lines=10)
-        assert len(parsed) < 10
-        assert len(skipped) > 0
+        # Each file has 3 changed lines; with a limit of 10, only 3 files fit
+        parsed, skipped = parse_pr_files(_BULK_FILES[:10], max_lines=10)
+        assert len(parsed) == 3
+        assert len(skipped) == 7
+
+    def test_max_lines_uses_github_counts(self):
+        # 3 changed lines per file (additions + deletions), regardless of patch length
+        parsed, skipped = parse_pr_files(_BULK_FILES[:5], max_lines=9)
+        assert len(parsed) == 3
+        assert skipped == ["file_3.py", "file_4.py"]
+
+    def test_max_lines_falls_back_to_patch_length(self):
+        # Without GitHub's counts, every line of the patch counts against the budget
+        files = [
+            GitHubFile(filename=f"file_{i}.py", status="modified", patch=SIMPLE_PATCH)
+            for i in range(3)
+        ]
+        patch_lines = SIMPLE_PATCH.count("\n") + 1
+        parsed, skipped = parse_pr_files(files, max_lines=2 * patch_lines)
+        assert [f.filename for f in parsed] == ["file_0.py", "file_1.py"]
+        assert skipped == ["file_2.py"]
 
     def test_empty_input(self):
         parsed, skipped = parse_pr_files([])
@@ -222,6 +335,5 @@ class TestParsePRFiles:
         assert len(skipped) == 2
 
     def test_preserves_order(self):
-        files = [self._make_file(f"file_{i}.py") for i in range(5)]
-        parsed, _ = parse_pr_files(files)
+        parsed, _ = parse_pr_files(_BULK_FILES[:5])
         assert [f.filename for f in parsed] == [f"file_{i}.py" for i in range(5)]
@@ -21,6 +21,42 @@ from lintwise.core.exceptions import (
     ValidationError,
 )
 
+# (child, parent) pairs: each exception and its immediate base
+_HIERARCHY = [
+    (LintwiseError, Exception),
+    (GitHubError, LintwiseError),
+    (GitHubAuthError, GitHubError),
+    (GitHubRateLimitError, GitHubError),
+    (PRNotFoundError, GitHubError),
+    (LLMError, LintwiseError),
+    (LLMRateLimitError, LLMError),
+    (LLMContextOverflowError, LLMError),
+    (LLMResponseParseError, LLMError),
+    (PipelineError, LintwiseError),
+    (AgentTimeoutError, PipelineError),
+    (DiffTooLargeError, PipelineError),
+    (ValidationError, LintwiseError),
+    (InvalidPRURLError, ValidationError),
+]
+
+# Zero-arg factories for one instance of every domain exception
+_FACTORIES = [
+    lambda: LintwiseError("base"),
+    lambda: GitHubError("gh"),
+    lambda: GitHubAuthError("auth"),
+    lambda: GitHubRateLimitError(reset_at=0),
+    lambda: PRNotFoundError("pr"),
+    lambda: LLMError("llm"),
+    lambda: LLMRateLimitError("rate"),
+    lambda: LLMContextOverflowError("ctx"),
+    lambda: LLMResponseParseError("parse"),
+    lambda: PipelineError("pipe"),
+    lambda: AgentTimeoutError("timeout"),
+    lambda: DiffTooLargeError("large"),
+    lambda: ValidationError("val"),
+    lambda: InvalidPRURLError("url"),
+]
+
 
 class TestLintwiseError:
     """Tests for the base exception."""
@@ -40,9 +76,6 @@ class TestLintwiseError:
         assert str(err) == ""
         assert err.detail == ""
 
-    def test_is_exception(self):
-        assert issubclass(LintwiseError, Exception)
-
     def test_catchable_as_exception(self):
         with pytest.raises(Exception):
             raise LintwiseError("test")
@@ -51,12 +84,6 @@ class TestLintwiseError:
 class TestGitHubExceptions:
     """Tests for GitHub-related exceptions."""
 
-    def test_github_error_hierarchy(self):
-        assert issubclass(GitHubError, LintwiseError)
-        assert issubclass(GitHubAuthError, GitHubError)
-        assert issubclass(GitHubRateLimitError, GitHubError)
-        assert issubclass(PRNotFoundError, GitHubError)
-
     def test_github_error(self):
         err = GitHubError("API failed")
         assert str(err) == "API failed"
@@ -82,28 +109,10 @@ class TestGitHubExceptions:
         err = PRNotFoundError("PR #999 not found")
         assert isinstance(err, GitHubError)
 
-    def test_catch_github_errors_broadly(self):
-        """All GitHub errors should be catchable as GitHubError."""
-        errors = [
-            GitHubError("e1"),
-            GitHubAuthError("e2"),
-            GitHubRateLimitError(reset_at=0),
-            PRNotFoundError("e4"),
-        ]
-        for err in errors:
-            with pytest.raises(GitHubError):
-                raise err
-
 
 class TestLLMExceptions:
     """Tests for LLM-related exceptions."""
 
-    def test_llm_error_hierarchy(self):
-        assert issubclass(LLMError, LintwiseError)
-        assert issubclass(LLMRateLimitError, LLMError)
-        assert issubclass(LLMContextOverflowError, LLMError)
-        assert issubclass(LLMResponseParseError, LLMError)
-
     def test_llm_error(self):
         err = LLMError("OpenAI unavailable")
         assert str(err) == "OpenAI unavailable"
@@ -120,26 +129,10 @@ class TestLLMExceptions:
         err = LLMResponseParseError("Invalid JSON in response")
         assert isinstance(err, LLMError)
 
-    def test_catch_llm_errors_broadly(self):
-        errors = [
-            LLMError("e1"),
-            LLMRateLimitError("e2"),
-            LLMContextOverflowError("e3"),
-            LLMResponseParseError("e4"),
-        ]
-        for err in errors:
-            with pytest.raises(LLMError):
-                raise err
-
 
 class TestPipelineExceptions:
     """Tests for pipeline-related exceptions."""
 
-    def test_pipeline_error_hierarchy(self):
-        assert issubclass(PipelineError, LintwiseError)
-        assert issubclass(AgentTimeoutError, PipelineError)
-        assert issubclass(DiffTooLargeError, PipelineError)
-
     def test_agent_timeout(self):
         err = AgentTimeoutError("logic_agent timed out after 120s")
         assert isinstance(err, PipelineError)
@@ -152,36 +145,24 @@ class TestPipelineExceptions:
 class TestValidationExceptions:
     """Tests for validation-related exceptions."""
 
-    def test_validation_error_hierarchy(self):
-        assert issubclass(ValidationError, LintwiseError)
-        assert issubclass(InvalidPRURLError, ValidationError)
-
     def test_invalid_pr_url(self):
         err = InvalidPRURLError("Cannot parse: https://not-github.com/foo")
         assert isinstance(err, ValidationError)
         assert isinstance(err, LintwiseError)
 
 
-class TestExceptionCatchAllHierarchy:
-    """Verify that catching LintwiseError catches ALL domain exceptions."""
-
-    def test_all_exceptions_caught_by_base(self):
-        all_exceptions = [
-            LintwiseError("base"),
-            GitHubError("gh"),
-            GitHubAuthError("auth"),
-            GitHubRateLimitError(reset_at=0),
-            PRNotFoundError("pr"),
-            LLMError("llm"),
-            LLMRateLimitError("rate"),
-            LLMContextOverflowError("ctx"),
-            LLMResponseParseError("parse"),
-            PipelineError("pipe"),
-            AgentTimeoutError("timeout"),
-            DiffTooLargeError("large"),
-            ValidationError("val"),
-            InvalidPRURLError("url"),
-        ]
-        for err in all_exceptions:
-            with pytest.raises(LintwiseError):
-                raise err
+class TestExceptionHierarchy:
+    """Every domain exception sits under its family base and under LintwiseError."""
+
+    @pytest.mark.parametrize(("child", "parent"), _HIERARCHY, ids=lambda cls: cls.__name__)
+    def test_hierarchy(self, child, parent):
+        assert issubclass(child, parent)
+
+    @pytest.mark.parametrize(
+        "make_error",
+        _FACTORIES,
+        ids=lambda factory: type(factory()).__name__,
+    )
+    def test_caught_by_base(self, make_error):
+        with pytest.raises(LintwiseError):
+            raise make_error()
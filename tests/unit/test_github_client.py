@@ -1,66 +1,199 @@
-"""Comprehensive tests for lintwise.github.client — URL parsing and error handling."""
+"""Comprehensive tests for lintwise.github.client — URL parsing and PR fetching."""
 
 from __future__ import annotations
 
+import httpx
 import pytest
+from pydantic import SecretStr
 
-from lintwise.core.exceptions import InvalidPRURLError
-from lintwise.github.client import parse_pr_url
+from lintwise.core.config import Settings
+from lintwise.core.exceptions import (
+    GitHubAuthError,
+    GitHubError,
+    GitHubRateLimitError,
+    InvalidPRURLError,
+    PRNotFoundError,
+)
+from lintwise.github.client import GitHubClient, parse_pr_url
+
+# (url, owner, repo, number)
+_VALID_PR_URLS = [
+    pytest.param(
+        "https://github.com/octocat/hello-world/pull/42",
+        "octocat",
+        "hello-world",
+        42,
+        id="standard",
+    ),
+    pytest.param(
+        "https://github.com/org/repo/pull/1  ", "org", "repo", 1, id="trailing-whitespace"
+    ),
+    pytest.param("http://github.com/org/repo/pull/99", "org", "repo", 99, id="http"),
+    pytest.param(
+        "https://github.com/org/repo/pull/99999", "org", "repo", 99999, id="large-number"
+    ),
+    pytest.param("https://github.com/org/repo/pull/42/files", "org", "repo", 42, id="sub-path"),
+    pytest.param("https://github.com/org/repo/pull/42?w=1", "org", "repo", 42, id="query"),
+    pytest.param(
+        "https://github.com/my-org/my-awesome-repo/pull/123",
+        "my-org",
+        "my-awesome-repo",
+        123,
+        id="hyphenated",
+    ),
+    pytest.param(
+        "https://github.com/my_org/my_repo/pull/5", "my_org", "my_repo", 5, id="underscored"
+    ),
+]
+
+_INVALID_PR_URLS = [
+    pytest.param("https://github.com/org/repo/issues/1", id="no-pull"),
+    pytest.param("https://gitlab.com/org/repo/pull/1", id="not-github"),
+    pytest.param("", id="empty"),
+    pytest.param("not a url at all", id="random-text"),
+    pytest.param("https://github.com/org/repo/pull/", id="missing-number"),
+    pytest.param("https://github.com/org/repo/pull/42abc", id="trailing-garbage"),
+]
 
 
 class TestParsePRUrl:
-    def test_standard_url(self):
-        owner, repo, num = parse_pr_url("https://github.com/octocat/hello-world/pull/42")
-        assert owner == "octocat"
-        assert repo == "hello-world"
-        assert num == 42
-
-    def test_url_with_trailing_slashes(self):
-        owner, repo, num = parse_pr_url("https://github.com/org/repo/pull/1  ")
-        assert owner == "org"
-        assert repo == "repo"
-        assert num == 1
-
-    def test_url_with_http(self):
-        owner, repo, num = parse_pr_url("http://github.com/org/repo/pull/99")
-        assert owner == "org"
-        assert num == 99
-
-    def test_large_pr_number(self):
-        owner, repo, num = parse_pr_url("https://github.com/org/repo/pull/99999")
-        assert num == 99999
-
-    def test_invalid_url_no_pull(self):
-        with pytest.raises(InvalidPRURLError):
-            parse_pr_url("https://github.com/org/repo/issues/1")
+    @pytest.mark.parametrize(("url", "owner", "repo", "number"), _VALID_PR_URLS)
+    def test_valid(self, url, owner, repo, number):
+        assert parse_pr_url(url) == (owner, repo, number)
 
-    def test_invalid_url_not_github(self):
+    @pytest.mark.parametrize("url", _INVALID_PR_URLS)
+    def test_invalid(self, url):
         with pytest.raises(InvalidPRURLError):
-            parse_pr_url("https://gitlab.com/org/repo/pull/1")
+            parse_pr_url(url)
 
-    def test_invalid_url_empty(self):
-        with pytest.raises(InvalidPRURLError):
-            parse_pr_url("")
 
-    def test_invalid_url_random_text(self):
-        with pytest.raises(InvalidPRURLError):
-            parse_pr_url("not a url at all")
+def _file(name: str) -> dict:
+    return {
+        "filename": name,
+        "status": "modified",
+        "additions": 1,
+        "deletions": 0,
+        "patch": "@@ -1 +1 @@\n+x",
+    }
 
-    def test_invalid_url_missing_number(self):
-        with pytest.raises(InvalidPRURLError):
-            parse_pr_url("https://github.com/org/repo/pull/")
 
-    def test_hyphenated_names(self):
-        owner, repo, num = parse_pr_url(
-            "https://github.com/my-org/my-awesome-repo/pull/123"
+def _pr_files_handler(total_pages: int, requested: list[int]):
+    """Mock GitHub: PR metadata plus a paginated files listing with Link headers."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/files"):
+            page = int(request.url.params["page"])
+            requested.append(page)
+            headers = {}
+            if total_pages > 1:
+                last = f"https://api.github.com{request.url.path}?per_page=100&page={total_pages}"
+                headers["Link"] = f'<{last}>; rel="last"'
+            return httpx.Response(200, json=[_file(f"p{page}.py")], headers=headers)
+        return httpx.Response(
+            200,
+            json={
+                "number": 7,
+                "title": "Add feature",
+                "head": {"ref": "feature", "sha": "abc"},
+                "base": {"ref": "main", "sha": "def"},
+                "html_url": "https://github.com/o/r/pull/7",
+            },
         )
-        assert owner == "my-org"
-        assert repo == "my-awesome-repo"
-        assert num == 123
 
-    def test_underscored_names(self):
-        owner, repo, num = parse_pr_url(
-            "https://github.com/my_org/my_repo/pull/5"
+    return handler
+
+
+@pytest.fixture
+def make_client():
+    def factory(handler) -> GitHubClient:
+        client = GitHubClient(
+            Settings(github_token=SecretStr("ghp_test"), openai_api_key=SecretStr("sk-test"))
         )
-        assert owner == "my_org"
-        assert repo == "my_repo"
+        client._client = httpx.AsyncClient(
+            base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+        )
+        return client
+
+    return factory
+
+
+class TestGitHubClientFetch:
+    @pytest.mark.asyncio
+    async def test_client_headers_and_reuse(self):
+        client = GitHubClient(
+            Settings(github_token=SecretStr("ghp_test"), openai_api_key=SecretStr("sk-test"))
+        )
+        http = await client._get_client()
+        assert http.headers["Authorization"] == "Bearer ghp_test"
+        assert http.headers["X-GitHub-Api-Version"] == "2022-11-28"
+        assert await client._get_client() is http
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_get_pr_files_fetches_all_pages(self, make_client):
+        requested: list[int] = []
+        client = make_client(_pr_files_handler(3, requested))
+        files = await client.get_pr_files("o", "r", 7)
+        assert [f.filename for f in files] == ["p1.py", "p2.py", "p3.py"]
+        assert sorted(requested) == [1, 2, 3]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_get_pr_files_single_page(self, make_client):
+        requested: list[int] = []
+        client = make_client(_pr_files_handler(1, requested))
+        files = await client.get_pr_files("o", "r", 7)
+        assert len(files) == 1
+        assert requested == [1]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_get_pr_diff(self, make_client):
+        client = make_client(_pr_files_handler(2, []))
+        diff = await client.get_pr_diff("o", "r", 7)
+        assert diff.title == "Add feature"
+        assert diff.base_branch == "main"
+        assert [f.filename for f in diff.files] == ["p1.py", "p2.py"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_get_pr_diff_raises_first_error(self, make_client):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/files"):
+                return httpx.Response(404, json={"message": "Not Found"})
+            return _pr_files_handler(1, [])(request)
+
+        client = make_client(handler)
+        with pytest.raises(PRNotFoundError):
+            await client.get_pr_diff("o", "r", 7)
+        await client.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("status", "body", "headers", "exc_type"),
+        [
+            (401, {"message": "Bad credentials"}, {}, GitHubAuthError),
+            (
+                403,
+                {"message": "API rate limit exceeded"},
+                {"X-RateLimit-Reset": "1700000000"},
+                GitHubRateLimitError,
+            ),
+            (404, {"message": "Not Found"}, {}, PRNotFoundError),
+            (500, {"message": "Server Error"}, {}, GitHubError),
+        ],
+    )
+    async def test_error_mapping(self, make_client, status, body, headers, exc_type):
+        client = make_client(lambda request: httpx.Response(status, json=body, headers=headers))
+        with pytest.raises(exc_type) as exc_info:
+            await client.get_pull_request("o", "r", 7)
+        if exc_type is not GitHubRateLimitError:
+            assert body["message"] in str(exc_info.value)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_error_with_non_json_body(self, make_client):
+        client = make_client(lambda request: httpx.Response(502, text="<html>Bad gateway</html>"))
+        with pytest.raises(GitHubError, match="HTTP 502"):
+            await client.get_pull_request("o", "r", 7)
+        await client.close()
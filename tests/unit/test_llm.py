@@ -3,10 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
+import httpx
+import openai
 import pytest
+import tiktoken
+from pydantic import SecretStr
 
+from lintwise.core.config import Settings
+from lintwise.core.exceptions import LLMContextOverflowError, LLMError, LLMRateLimitError
 from lintwise.llm.base import LLMProvider, LLMResponse
+from lintwise.llm import openai_provider
+from lintwise.llm.openai_provider import OpenAIProvider
 from lintwise.llm.rate_limiter import TokenBucketRateLimiter
 
 
@@ -25,6 +35,7 @@ class TestLLMResponse:
         r = LLMResponse(content="Hi")
         assert r.prompt_tokens == 0
         assert r.completion_tokens == 0
+        assert r.cached_tokens == 0
         assert r.model == ""
 
     def test_serialization(self):
@@ -37,22 +48,205 @@ class TestLLMResponse:
 # ── LLMProvider Interface ──────────────────────────────────────────────────
 
 
+class MockProvider(LLMProvider):
+    async def complete(self, messages, **kwargs):
+        return LLMResponse(content="mock")
+
+    async def count_tokens(self, text):
+        return len(text)
+
+    async def close(self):
+        pass
+
+
 class TestLLMProviderInterface:
     def test_cannot_instantiate_abstract(self):
         with pytest.raises(TypeError):
             LLMProvider()
 
     def test_concrete_implementation(self):
-        class MockProvider(LLMProvider):
-            async def complete(self, messages, **kwargs):
-                return LLMResponse(content="mock")
-            async def count_tokens(self, text):
-                return len(text)
-            async def close(self):
-                pass
+        assert MockProvider() is not None
 
+    @pytest.mark.asyncio
+    async def test_default_count_tokens_batch(self):
+        assert await MockProvider().count_tokens_batch(["ab", "", "abcd"]) == [2, 0, 4]
+
+    def test_default_estimate_tokens(self, monkeypatch):
         provider = MockProvider()
-        assert provider is not None
+
+        async def _no_tokenize(text):
+            raise AssertionError("estimate must not tokenize")
+
+        monkeypatch.setattr(provider, "count_tokens", _no_tokenize)
+        assert provider.estimate_tokens("x" * 4000) == 1000
+        assert provider.estimate_tokens("") == 0
+
+
+# ── OpenAI Provider ─────────────────────────────────────────────────────────
+
+
+_OPENAI_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _openai_response(status: int) -> httpx.Response:
+    return httpx.Response(status, request=_OPENAI_REQUEST)
+
+
+class TestOpenAIProvider:
+    @pytest.fixture
+    def settings(self) -> Settings:
+        return Settings(
+            github_token=SecretStr("ghp_test"),
+            openai_api_key=SecretStr("sk-test"),
+            review_timeout_seconds=90,
+            _env_file=None,
+        )
+
+    @pytest.fixture
+    def provider(self, monkeypatch, settings: Settings) -> OpenAIProvider:
+        monkeypatch.setattr(openai_provider, "_get_encoding", lambda model: None)
+        return OpenAIProvider(settings)
+
+    def test_encoding_cached_per_model(self, monkeypatch):
+        calls: list[str] = []
+
+        def encoding_for_model(model: str):
+            calls.append(model)
+            if model == "unknown-model":
+                raise KeyError(model)
+            return f"enc:{model}"
+
+        monkeypatch.setattr(tiktoken, "encoding_for_model", encoding_for_model)
+        monkeypatch.setattr(tiktoken, "get_encoding", lambda name: f"enc:{name}")
+        openai_provider._get_encoding.cache_clear()
+        try:
+            assert openai_provider._get_encoding("gpt-4o") == "enc:gpt-4o"
+            assert openai_provider._get_encoding("gpt-4o") == "enc:gpt-4o"
+            assert openai_provider._get_encoding("unknown-model") == "enc:cl100k_base"
+            assert calls == ["gpt-4o", "unknown-model"]
+        finally:
+            openai_provider._get_encoding.cache_clear()
+
+    @pytest.fixture
+    def encoding(self, provider: OpenAIProvider):
+        class FakeEncoding:
+            def __init__(self):
+                self.encoded: list[str] = []
+
+            def encode(self, text):
+                self.encoded.append(text)
+                return text.split()
+
+            def encode_batch(self, texts):
+                self.encoded.extend(texts)
+                return [t.split() for t in texts]
+
+        provider._encoding = FakeEncoding()
+        return provider._encoding
+
+    @pytest.mark.asyncio
+    async def test_count_tokens_batch(self, provider: OpenAIProvider, encoding):
+        assert await provider.count_tokens_batch(["a b c", "d"]) == [3, 1]
+
+    @pytest.mark.asyncio
+    async def test_count_tokens_cached(self, provider: OpenAIProvider, encoding):
+        assert await provider.count_tokens("a b") == 2
+        assert await provider.count_tokens("a b") == 2
+        assert await provider.count_tokens_batch(["a b", "c d e", "c d e"]) == [2, 3, 3]
+        assert encoding.encoded == ["a b", "c d e"]
+
+    @pytest.mark.asyncio
+    async def test_count_tokens_cache_evicts_oldest(
+        self, provider: OpenAIProvider, encoding, monkeypatch
+    ):
+        monkeypatch.setattr(openai_provider, "_TOKEN_COUNT_CACHE_SIZE", 2)
+        for text in ("a", "b", "c"):
+            await provider.count_tokens(text)
+        await provider.count_tokens("a")
+        assert encoding.encoded == ["a", "b", "c", "a"]
+
+    @pytest.mark.asyncio
+    async def test_complete_reports_cached_tokens(self, provider: OpenAIProvider, monkeypatch):
+        usage = SimpleNamespace(
+            prompt_tokens=1500,
+            completion_tokens=40,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1280),
+        )
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))],
+            usage=usage,
+            model="gpt-4o",
+        )
+        create = AsyncMock(return_value=response)
+        monkeypatch.setattr(provider._client.chat.completions, "create", create)
+
+        result = await provider.complete([{"role": "user", "content": "hi"}], user="logic_agent")
+
+        assert result.cached_tokens == 1280
+        assert result.prompt_tokens == 1500
+        assert create.call_args.kwargs["user"] == "logic_agent"
+
+        usage.prompt_tokens_details = None
+        assert (await provider.complete([{"role": "user", "content": "hi"}])).cached_tokens == 0
+        assert "user" not in create.call_args.kwargs
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (
+                openai.RateLimitError(
+                    "Rate limit reached", response=_openai_response(429), body=None
+                ),
+                LLMRateLimitError,
+            ),
+            (
+                openai.BadRequestError(
+                    "This model's maximum context length is 128000 tokens",
+                    response=_openai_response(400),
+                    body={"code": "context_length_exceeded"},
+                ),
+                LLMContextOverflowError,
+            ),
+            (
+                openai.BadRequestError(
+                    "Invalid 'max_tokens'", response=_openai_response(400), body=None
+                ),
+                LLMError,
+            ),
+            (
+                openai.APIConnectionError(
+                    message="token endpoint unreachable", request=_OPENAI_REQUEST
+                ),
+                LLMError,
+            ),
+        ],
+    )
+    async def test_complete_maps_sdk_errors_by_type(
+        self, provider: OpenAIProvider, monkeypatch, error, expected
+    ):
+        monkeypatch.setattr(
+            provider._client.chat.completions, "create", AsyncMock(side_effect=error)
+        )
+        with pytest.raises(LLMError) as exc_info:
+            await provider.complete([{"role": "user", "content": "hi"}])
+        assert type(exc_info.value) is expected
+        assert exc_info.value.__cause__ is error
+
+    @pytest.mark.asyncio
+    async def test_close_only_closes_own_client(self, provider: OpenAIProvider, settings: Settings):
+        other = OpenAIProvider(settings)
+        assert other._client is not provider._client
+
+        await provider.close()
+        assert provider._client.is_closed()
+        assert not other._client.is_closed()
+        await other.close()
+
+    def test_http_client_timeouts(self, provider: OpenAIProvider):
+        timeout = provider._client.timeout
+        assert timeout.connect == 5.0
+        assert timeout.read == 90
 
 
 # ── Rate Limiter ────────────────────────────────────────────────────────────
@@ -74,17 +268,107 @@ class TestTokenBucketRateLimiter:
     @pytest.mark.asyncio
     async def test_concurrency_limit(self):
         limiter = TokenBucketRateLimiter(rpm=1000, tpm=1000000, max_concurrent=2)
-        acquired = 0
+        acquired = active = peak = 0
+        full = asyncio.Event()
+        release = asyncio.Event()
 
         async def worker():
-            nonlocal acquired
+            nonlocal acquired, active, peak
             async with limiter:
                 acquired += 1
-                await asyncio.sleep(0.01)
+                active += 1
+                peak = max(peak, active)
+                if active == 2:
+                    full.set()
+                await release.wait()
+                active -= 1
 
         tasks = [asyncio.create_task(worker()) for _ in range(5)]
-        await asyncio.gather(*tasks)
+        await asyncio.wait_for(full.wait(), timeout=1.0)
+        assert acquired == 2  # The rest are held back by the cap
+        release.set()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=1.0)
         assert acquired == 5  # All should complete eventually
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquires_never_overdraw(self):
+        limiter = TokenBucketRateLimiter(rpm=3, tpm=1000000, max_concurrent=3)
+        await asyncio.gather(*(limiter.acquire(estimated_tokens=10) for _ in range(3)))
+        assert 0 <= limiter._request_tokens < 1
+
+    @pytest.mark.asyncio
+    async def test_waits_only_until_refill(self):
+        limiter = TokenBucketRateLimiter(rpm=1200, tpm=1000000, max_concurrent=2)
+        limiter._request_tokens = 0.0  # Next request is 50ms away at 20/s
+        await asyncio.wait_for(limiter.acquire(estimated_tokens=10), timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_returned_tokens_wake_waiters(self):
+        limiter = TokenBucketRateLimiter(rpm=1000, tpm=600, max_concurrent=2)
+        await limiter.acquire(estimated_tokens=600)  # Drains the token bucket
+        waiter = asyncio.create_task(limiter.acquire(estimated_tokens=300))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()  # ~30s until refill
+
+        limiter.release(unused_tokens=300)
+        await asyncio.wait_for(waiter, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_estimate_capped_at_tpm(self):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=500, max_concurrent=2)
+        await asyncio.wait_for(limiter.acquire(estimated_tokens=5000), timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_slot(self):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, max_concurrent=1)
+        async with limiter.slot(estimated_tokens=200):
+            assert limiter._semaphore.locked()
+            assert limiter._token_tokens == pytest.approx(800, abs=1)
+        assert not limiter._semaphore.locked()
+
+    @pytest.mark.asyncio
+    async def test_slot_returns_unused_tokens(self):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, max_concurrent=2)
+        async with limiter.slot(estimated_tokens=600) as reservation:
+            waiter = asyncio.create_task(limiter.acquire(estimated_tokens=700))
+            await asyncio.sleep(0.01)
+            assert not waiter.done()  # ~18s until refill
+            reservation.used = 250
+        await asyncio.wait_for(waiter, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_slot_keeps_reservation_without_usage(self):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, max_concurrent=1)
+        async with limiter.slot(estimated_tokens=600) as reservation:
+            assert reservation.reserved == 600
+        assert limiter._token_tokens == pytest.approx(400, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_no_tokens_spent_while_waiting_for_slot(self):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, max_concurrent=1)
+        await limiter.acquire(estimated_tokens=100)
+        blocked = asyncio.create_task(limiter.acquire(estimated_tokens=500))
+        await asyncio.sleep(0.01)
+        assert limiter._token_tokens == pytest.approx(900, abs=1)
+
+        blocked.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocked
+        limiter.release()
+        assert not limiter._semaphore.locked()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_bucket_wait_returns_slot(self):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=600, max_concurrent=2)
+        await limiter.acquire(estimated_tokens=600)
+        waiter = asyncio.create_task(limiter.acquire(estimated_tokens=600))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        # Only the first acquire still holds a slot
+        await asyncio.wait_for(limiter._semaphore.acquire(), timeout=1.0)
 
     def test_initialization(self):
         limiter = TokenBucketRateLimiter(rpm=60, tpm=150000, max_concurrent=4)
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import json
 import logging
 
+import pytest
 import structlog
 
 from lintwise.core.logging import get_logger, setup_logging
@@ -56,30 +58,52 @@ class TestSetupLogging:
         root = logging.getLogger()
         assert root.level == logging.INFO
 
+    def test_json_output(self, capsys):
+        setup_logging("INFO")
+        get_logger("json_test").info("json_event", count=3, obj=object())
+        line = capsys.readouterr().out.strip().splitlines()[-1]
+        record = json.loads(line)
+        assert record["event"] == "json_event"
+        assert record["count"] == 3
+        assert record["level"] == "info"
+        assert record["logger"] == "json_test"
+        assert record["obj"].startswith("<object")
+
+    def test_filters_below_level(self, capsys):
+        setup_logging("WARNING")
+        log = get_logger("filter_test")
+        log.info("dropped_event")
+        log.warning("kept_event")
+        out = capsys.readouterr().out
+        assert "dropped_event" not in out
+        assert "kept_event" in out
+
 
 class TestGetLogger:
     """Tests for the get_logger helper."""
 
-    def test_returns_bound_logger(self):
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def _configured(cls):
+        # These tests only need logging configured, not a particular setup
         setup_logging("INFO")
+
+    def test_returns_bound_logger(self):
         logger = get_logger("test_module")
         assert logger is not None
 
     def test_logger_can_bind_context(self):
-        setup_logging("INFO")
         logger = get_logger("test_module")
         bound = logger.bind(request_id="abc123")
         assert bound is not None
 
     def test_different_names_different_loggers(self):
-        setup_logging("INFO")
         logger1 = get_logger("module_a")
         logger2 = get_logger("module_b")
         # They should be distinct logger instances
         assert logger1 is not logger2
 
     def test_logger_has_expected_methods(self):
-        setup_logging("INFO")
         logger = get_logger("test")
         assert callable(getattr(logger, "info", None))
         assert callable(getattr(logger, "warning", None))
@@ -129,10 +129,9 @@ class TestFileChange:
         with pytest.raises(ValidationError):
             FileChange(filename="test.py", status="invalid_status")
 
-    def test_all_statuses(self):
-        for status in FileStatus:
-            fc = FileChange(filename="test.py", status=status)
-            assert fc.status == status
+    @pytest.mark.parametrize("status", list(FileStatus))
+    def test_all_statuses(self, status):
+        assert FileChange(filename="test.py", status=status).status == status
 
     def test_serialization_roundtrip(self, sample_file_change: FileChange):
         data = sample_file_change.model_dump()
@@ -222,32 +221,26 @@ class TestReviewComment:
         )
         assert rc.confidence == 1.0
 
-    def test_confidence_out_of_bounds(self):
-        with pytest.raises(ValidationError):
-            ReviewComment(
-                file="t.py", severity=Severity.NITPICK, category=ReviewCategory.LOGIC,
-                title="T", body="B", confidence=1.5,
-            )
-
-        with pytest.raises(ValidationError):
-            ReviewComment(
-                file="t.py", severity=Severity.NITPICK, category=ReviewCategory.LOGIC,
-                title="T", body="B", confidence=-0.1,
-            )
-
-    def test_invalid_severity_rejected(self):
-        with pytest.raises(ValidationError):
-            ReviewComment(
-                file="t.py", severity="blocker", category=ReviewCategory.LOGIC,
-                title="T", body="B",
-            )
-
-    def test_invalid_category_rejected(self):
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"confidence": 1.5},
+            {"confidence": -0.1},
+            {"severity": "blocker"},
+            {"category": "style"},
+        ],
+        ids=["confidence-above-1", "confidence-below-0", "unknown-severity", "unknown-category"],
+    )
+    def test_invalid_fields_rejected(self, overrides):
+        fields = {
+            "file": "t.py",
+            "severity": Severity.NITPICK,
+            "category": ReviewCategory.LOGIC,
+            "title": "T",
+            "body": "B",
+        }
         with pytest.raises(ValidationError):
-            ReviewComment(
-                file="t.py", severity=Severity.WARNING, category="style",
-                title="T", body="B",
-            )
+            ReviewComment(**(fields | overrides))
 
     def test_with_suggestion(self):
         rc = ReviewComment(
@@ -310,15 +303,12 @@ class TestReviewResult:
         rr = ReviewResult(
             pr_diff=PRDiff(repo_owner="o", repo_name="r", pr_number=1),
         )
-        assert len(rr.id) == 12  # hex[:12]
-
-    def test_unique_ids(self):
-        ids = set()
-        for _ in range(100):
-            rr = ReviewResult(
-                pr_diff=PRDiff(repo_owner="o", repo_name="r", pr_number=1),
-            )
-            ids.add(rr.id)
+        assert len(rr.id) == 12
+        int(rr.id, 16)  # hex
+
+    def test_unique_ids(self, sample_pr_diff: PRDiff):
+        # A PRDiff instance is accepted as-is, so only the result itself is built each time
+        ids = {ReviewResult(pr_diff=sample_pr_diff).id for _ in range(100)}
         assert len(ids) == 100  # All unique
 
     def test_auto_timestamp(self):
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 
 import pytest
@@ -26,14 +27,15 @@ from lintwise.orchestrator.pipeline import run_review
 
 class MockLLM(LLMProvider):
     def __init__(self, findings=None, delay: float = 0.0):
-        self._findings = findings or []
+        # Encoded once; every completion returns the same payload
+        self._content = json.dumps({"findings": findings or []})
         self._delay = delay
 
     async def complete(self, messages, **kwargs) -> LLMResponse:
         if self._delay:
             await asyncio.sleep(self._delay)
         return LLMResponse(
-            content=json.dumps({"findings": self._findings}),
+            content=self._content,
             prompt_tokens=50,
             completion_tokens=25,
         )
@@ -48,8 +50,13 @@ class MockLLM(LLMProvider):
 class SlowMockLLM(LLMProvider):
     """LLM that takes too long — for timeout testing."""
 
+    def __init__(self, delay: float = 1.0):
+        # Well past the tests' timeouts, but short enough that a broken
+        # timeout path fails the test quickly instead of hanging it
+        self._delay = delay
+
     async def complete(self, messages, **kwargs) -> LLMResponse:
-        await asyncio.sleep(100)  # Way longer than any timeout
+        await asyncio.sleep(self._delay)
         return LLMResponse(content="[]")
 
     async def count_tokens(self, text: str) -> int:
@@ -62,8 +69,10 @@ class SlowMockLLM(LLMProvider):
 # ── Sample Data ─────────────────────────────────────────────────────────────
 
 
-def _pr_diff(n_files: int = 1) -> PRDiff:
-    files = [
+@functools.cache
+def _files(n_files: int) -> tuple[FileChange, ...]:
+    # Tests replace list entries but never modify a FileChange, so these are shared
+    return tuple(
         FileChange(
             filename=f"file_{i}.py",
             status=FileStatus.MODIFIED,
@@ -72,13 +81,21 @@ def _pr_diff(n_files: int = 1) -> PRDiff:
             language="python",
         )
         for i in range(n_files)
-    ]
-    return PRDiff(
+    )
+
+
+def _pr_diff(n_files: int = 1) -> PRDiff:
+    # Trusted test data: skip validation (test_sample_pr_diff_is_valid guards it)
+    return PRDiff.model_construct(
         repo_owner="org",
         repo_name="repo",
         pr_number=1,
         title="Test PR",
-        files=files,
+        description="",
+        base_branch="main",
+        head_branch="",
+        files=list(_files(n_files)),
+        raw_url=None,
     )
 
 
@@ -87,14 +104,30 @@ SAMPLE_FINDINGS = [
 ]
 
 
+# MockLLM holds no per-call state, so one of each serves every test
+@pytest.fixture(scope="module")
+def findings_llm() -> MockLLM:
+    return MockLLM(findings=SAMPLE_FINDINGS)
+
+
+@pytest.fixture(scope="module")
+def empty_llm() -> MockLLM:
+    return MockLLM()
+
+
 # ── Pipeline Tests ──────────────────────────────────────────────────────────
 
 
+class TestSampleData:
+    def test_sample_pr_diff_is_valid(self):
+        pr = _pr_diff(3)
+        assert PRDiff.model_validate(pr.model_dump()) == pr
+
+
 class TestRunReview:
     @pytest.mark.asyncio
-    async def test_basic_review(self):
-        llm = MockLLM(findings=SAMPLE_FINDINGS)
-        result = await run_review(_pr_diff(1), llm)
+    async def test_basic_review(self, findings_llm):
+        result = await run_review(_pr_diff(1), findings_llm)
 
         assert result.pr_diff.pr_number == 1
         assert len(result.comments) > 0
@@ -103,9 +136,8 @@ class TestRunReview:
         assert len(result.agent_metrics) > 0
 
     @pytest.mark.asyncio
-    async def test_multiple_files(self):
-        llm = MockLLM(findings=SAMPLE_FINDINGS)
-        result = await run_review(_pr_diff(3), llm)
+    async def test_multiple_files(self, findings_llm):
+        result = await run_review(_pr_diff(3), findings_llm)
 
         # 3 files × 4 agents = 12 tasks, each producing 1 finding
         assert len(result.agent_metrics) == 12
@@ -113,31 +145,28 @@ class TestRunReview:
         assert len(result.comments) >= 1
 
     @pytest.mark.asyncio
-    async def test_empty_pr(self):
-        llm = MockLLM()
+    async def test_empty_pr(self, empty_llm):
         pr = PRDiff(repo_owner="o", repo_name="r", pr_number=1, files=[])
-        result = await run_review(pr, llm)
+        result = await run_review(pr, empty_llm)
 
         assert result.comments == []
         assert result.risk_score == RiskScore.LOW
         assert result.agent_metrics == []
 
     @pytest.mark.asyncio
-    async def test_no_findings(self):
-        llm = MockLLM(findings=[])
-        result = await run_review(_pr_diff(1), llm)
+    async def test_no_findings(self, empty_llm):
+        result = await run_review(_pr_diff(1), empty_llm)
 
         assert result.comments == []
         assert result.risk_score == RiskScore.LOW
 
     @pytest.mark.asyncio
-    async def test_custom_agents(self):
+    async def test_custom_agents(self, findings_llm):
         """Only run specific agents."""
         from lintwise.agents.logic_agent import LogicAgent
 
-        llm = MockLLM(findings=SAMPLE_FINDINGS)
-        agent = LogicAgent(llm)
-        result = await run_review(_pr_diff(1), llm, agents=[agent])
+        agent = LogicAgent(findings_llm)
+        result = await run_review(_pr_diff(1), findings_llm, agents=[agent])
 
         assert len(result.agent_metrics) == 1
         assert result.agent_metrics[0].agent_name == "logic_agent"
@@ -167,9 +196,193 @@ class TestRunReview:
         assert "Timeout" in errored[0].error
 
     @pytest.mark.asyncio
-    async def test_result_has_correct_pr_ref(self):
-        llm = MockLLM(findings=[])
+    async def test_result_has_correct_pr_ref(self, empty_llm):
         pr = _pr_diff(1)
-        result = await run_review(pr, llm)
+        result = await run_review(pr, empty_llm)
         assert result.pr_diff.repo_owner == "org"
         assert result.pr_diff.repo_name == "repo"
+
+    @pytest.mark.asyncio
+    async def test_results_independent_of_completion_order(self):
+        """Later agents finish first; metrics and dedup still follow task order."""
+        from lintwise.agents.registry import create_all_agents
+
+        class StaggeredLLM(MockLLM):
+            delays = {"logic": 0.04, "readability": 0.03, "performance": 0.02, "security": 0.01}
+
+            async def complete(self, messages, **kwargs) -> LLMResponse:
+                system_prompt = messages[0]["content"]
+                category = next(c for c in self.delays if f"specializing in {c}" in system_prompt)
+                await asyncio.sleep(self.delays[category])
+                return await super().complete(messages, **kwargs)
+
+        llm = StaggeredLLM(findings=SAMPLE_FINDINGS)
+        agents = create_all_agents(llm)
+        result = await run_review(_pr_diff(1), llm, agents=agents)
+
+        assert [m.agent_name for m in result.agent_metrics] == [a.name for a in agents]
+        # Same finding from every agent with equal confidence → the first agent's copy is kept
+        assert len(result.comments) == 1
+        assert result.comments[0].agent_name == agents[0].name
+
+    @pytest.mark.asyncio
+    async def test_shared_rate_limiter_charged_per_task(self, empty_llm):
+        from lintwise.agents.logic_agent import LogicAgent
+        from lintwise.llm.rate_limiter import TokenBucketRateLimiter
+
+        agent = LogicAgent(empty_llm)
+        pr = _pr_diff(2)
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=10000, max_concurrent=1)
+
+        await run_review(pr, empty_llm, agents=[agent], rate_limiter=limiter)
+
+        # Each reservation is settled to the reported usage (50 prompt + 25 completion)
+        assert limiter._request_tokens == pytest.approx(98, abs=0.1)
+        assert 10000 - limiter._token_tokens == pytest.approx(2 * 75, abs=5)
+
+    @pytest.mark.asyncio
+    async def test_reserves_prompt_and_completion_budget(self, empty_llm, monkeypatch):
+        from lintwise.agents.logic_agent import LogicAgent
+        from lintwise.llm.rate_limiter import TokenBucketRateLimiter
+
+        agent = LogicAgent(empty_llm)
+        pr = _pr_diff(1)
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=100_000, max_concurrent=1)
+        reserved = []
+        slot = limiter.slot
+
+        def _recording_slot(estimated_tokens):
+            reserved.append(estimated_tokens)
+            return slot(estimated_tokens=estimated_tokens)
+
+        monkeypatch.setattr(limiter, "slot", _recording_slot)
+        await run_review(
+            pr, empty_llm, agents=[agent], rate_limiter=limiter, max_completion_tokens=1000
+        )
+
+        prompt_tokens = sum(len(m["content"]) // 4 for m in agent.build_messages(pr.files[0], pr))
+        assert reserved == [prompt_tokens + 1000]
+
+    @pytest.mark.asyncio
+    async def test_failed_request_keeps_reservation(self):
+        from lintwise.agents.logic_agent import LogicAgent
+        from lintwise.llm.rate_limiter import TokenBucketRateLimiter
+
+        class FailingLLM(MockLLM):
+            async def complete(self, messages, **kwargs):
+                raise RuntimeError("API down")
+
+        llm = FailingLLM()
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=100_000, max_concurrent=1)
+        await run_review(
+            _pr_diff(1),
+            llm,
+            agents=[LogicAgent(llm)],
+            rate_limiter=limiter,
+            max_completion_tokens=1000,
+        )
+
+        assert 100_000 - limiter._token_tokens > 1000
+
+    @pytest.mark.asyncio
+    async def test_files_batched_per_request(self):
+        from lintwise.agents.logic_agent import LogicAgent
+
+        class CountingLLM(MockLLM):
+            calls = 0
+
+            async def complete(self, messages, **kwargs):
+                CountingLLM.calls += 1
+                return LLMResponse(
+                    content=json.dumps({"findings": [{**SAMPLE_FINDINGS[0], "file_index": 2}]})
+                )
+
+        llm = CountingLLM()
+        result = await run_review(_pr_diff(5), llm, agents=[LogicAgent(llm)], files_per_request=2)
+
+        # 5 files in batches of 2 → 3 requests; the last batch has a single file
+        assert CountingLLM.calls == 3
+        assert [m.files_analyzed for m in result.agent_metrics] == [2, 2, 1]
+        # A lone file uses the single-file prompt, where file_index is ignored
+        assert sorted(c.file for c in result.comments) == ["file_1.py", "file_3.py", "file_4.py"]
+
+    @pytest.mark.asyncio
+    async def test_batch_messages_built_once(self, empty_llm, monkeypatch):
+        from lintwise.agents.logic_agent import LogicAgent
+
+        agent = LogicAgent(empty_llm)
+        built = []
+        build = agent.build_batch_messages
+
+        def _counting_build(files, context):
+            built.append([f.filename for f in files])
+            return build(files, context)
+
+        monkeypatch.setattr(agent, "build_batch_messages", _counting_build)
+        await run_review(_pr_diff(4), empty_llm, agents=[agent], files_per_request=2)
+
+        assert built == [["file_0.py", "file_1.py"], ["file_2.py", "file_3.py"]]
+
+    @pytest.mark.asyncio
+    async def test_failed_task_does_not_cancel_others(self):
+        from lintwise.agents.logic_agent import LogicAgent
+
+        class FlakyTokenizerLLM(MockLLM):
+            def estimate_tokens(self, text: str) -> int:
+                if "file_1.py" in text:
+                    raise RuntimeError("tokenizer crashed")
+                return super().estimate_tokens(text)
+
+        llm = FlakyTokenizerLLM(findings=SAMPLE_FINDINGS)
+        result = await run_review(_pr_diff(3), llm, agents=[LogicAgent(llm)])
+
+        assert len(result.agent_metrics) == 2
+        assert sorted(c.file for c in result.comments) == ["file_0.py", "file_2.py"]
+
+    @pytest.mark.asyncio
+    async def test_identical_patches_analyzed_once_per_agent(self):
+        from lintwise.agents.logic_agent import LogicAgent
+
+        class CountingLLM(MockLLM):
+            calls = 0
+
+            async def complete(self, messages, **kwargs):
+                CountingLLM.calls += 1
+                return await super().complete(messages, **kwargs)
+
+        pr = _pr_diff(3)
+        pr.files[2] = pr.files[0].model_copy(update={"filename": "copy_of_file_0.py"})
+        llm = CountingLLM(findings=SAMPLE_FINDINGS)
+        result = await run_review(pr, llm, agents=[LogicAgent(llm)])
+
+        assert CountingLLM.calls == 2
+        assert [m.cached for m in result.agent_metrics] == [False, False, True]
+        assert result.agent_metrics[2].prompt_tokens == 0
+        assert sorted(c.file for c in result.comments) == [
+            "copy_of_file_0.py",
+            "file_0.py",
+            "file_1.py",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_not_reused(self):
+        from lintwise.agents.logic_agent import LogicAgent
+
+        class FailOnceLLM(MockLLM):
+            calls = 0
+
+            async def complete(self, messages, **kwargs):
+                FailOnceLLM.calls += 1
+                if FailOnceLLM.calls == 1:
+                    raise RuntimeError("API down")
+                return await super().complete(messages, **kwargs)
+
+        pr = _pr_diff(1)
+        pr.files.append(pr.files[0].model_copy(update={"filename": "copy.py"}))
+        llm = FailOnceLLM(findings=SAMPLE_FINDINGS)
+        result = await run_review(pr, llm, agents=[LogicAgent(llm)])
+
+        assert FailOnceLLM.calls == 2
+        assert result.agent_metrics[0].error is not None
+        assert not result.agent_metrics[1].cached
+        assert [c.file for c in result.comments] == ["copy.py"]
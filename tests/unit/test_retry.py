@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
 from lintwise.core.exceptions import LLMRateLimitError
 from lintwise.orchestrator.retry import retry_with_backoff
 
 
+@pytest.fixture(autouse=True)
+def sleeps(monkeypatch) -> list[float]:
+    """Record backoff delays instead of waiting them out."""
+    delays: list[float] = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return delays
+
+
 class TestRetryWithBackoff:
     @pytest.mark.asyncio
     async def test_success_no_retry(self):
@@ -23,7 +37,7 @@ class TestRetryWithBackoff:
         assert call_count == 1
 
     @pytest.mark.asyncio
-    async def test_retries_on_retryable_error(self):
+    async def test_retries_on_retryable_error(self, sleeps):
         call_count = 0
 
         async def func():
@@ -36,6 +50,7 @@ class TestRetryWithBackoff:
         result = await retry_with_backoff(func, max_retries=3, base_delay=0.01)
         assert result == "success"
         assert call_count == 3
+        assert len(sleeps) == 2  # One backoff before each retry
 
     @pytest.mark.asyncio
     async def test_raises_after_max_retries(self):
@@ -93,3 +108,18 @@ class TestRetryWithBackoff:
 
         with pytest.raises(LLMRateLimitError):
             await retry_with_backoff(func, max_retries=0, base_delay=0.01)
+
+    @pytest.mark.asyncio
+    async def test_delays_use_full_jitter(self, sleeps):
+        async def func():
+            raise LLMRateLimitError("fail")
+
+        for _ in range(20):
+            with pytest.raises(LLMRateLimitError):
+                await retry_with_backoff(func, max_retries=4, base_delay=1.0, max_delay=5.0)
+
+        caps = [1.0, 2.0, 4.0, 5.0]
+        for attempt, cap in enumerate(caps):
+            attempt_delays = sleeps[attempt :: len(caps)]
+            assert all(0 <= d <= cap for d in attempt_delays)
+            assert len(set(attempt_delays)) > 1
@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-import hashlib
 import hmac
-import json
+from types import MappingProxyType
 
 import pytest
 
@@ -18,47 +17,36 @@ from lintwise.github.webhook import (
 # ── Signature Verification ──────────────────────────────────────────────────
 
 
-class TestVerifySignature:
-    SECRET = "test_webhook_secret_123"
-
-    def _sign(self, payload: bytes) -> str:
-        sig = hmac.new(self.SECRET.encode(), payload, hashlib.sha256).hexdigest()
-        return f"sha256={sig}"
+_SECRET = "test_webhook_secret_123"
+_SECRET_BYTES = _SECRET.encode()
 
-    def test_valid_signature(self):
-        payload = b'{"action": "opened"}'
-        sig = self._sign(payload)
-        assert verify_signature(payload, sig, self.SECRET) is True
 
-    def test_invalid_signature(self):
-        payload = b'{"action": "opened"}'
-        assert verify_signature(payload, "sha256=invalid_hex", self.SECRET) is False
+def _sign(payload: bytes) -> str:
+    return "sha256=" + hmac.digest(_SECRET_BYTES, payload, "sha256").hex()
 
-    def test_tampered_payload(self):
-        original = b'{"action": "opened"}'
-        sig = self._sign(original)
-        tampered = b'{"action": "closed"}'
-        assert verify_signature(tampered, sig, self.SECRET) is False
 
-    def test_missing_sha256_prefix(self):
-        payload = b'{"action": "opened"}'
-        sig = hmac.new(self.SECRET.encode(), payload, hashlib.sha256).hexdigest()
-        assert verify_signature(payload, sig, self.SECRET) is False  # No "sha256=" prefix
+_OPENED = b'{"action": "opened"}'
+_OPENED_SIG = _sign(_OPENED)
+_LARGE_PAYLOAD = b"x" * 100_000
 
-    def test_wrong_secret(self):
-        payload = b'{"action": "opened"}'
-        sig = self._sign(payload)
-        assert verify_signature(payload, sig, "wrong_secret") is False
+# (payload, signature, secret, expected); signed once at import
+_SIGNATURE_CASES = [
+    pytest.param(_OPENED, _OPENED_SIG, _SECRET, True, id="valid"),
+    pytest.param(_OPENED, "sha256=invalid_hex", _SECRET, False, id="invalid"),
+    pytest.param(b'{"action": "closed"}', _OPENED_SIG, _SECRET, False, id="tampered"),
+    pytest.param(_OPENED, _OPENED_SIG.removeprefix("sha256="), _SECRET, False, id="missing_prefix"),
+    pytest.param(_OPENED, _OPENED_SIG, "wrong_secret", False, id="wrong_secret"),
+    pytest.param(_OPENED, _OPENED_SIG, _SECRET_BYTES, True, id="bytes_secret"),
+    pytest.param(_OPENED, _OPENED_SIG, b"wrong_secret", False, id="wrong_bytes_secret"),
+    pytest.param(b"", _sign(b""), _SECRET, True, id="empty"),
+    pytest.param(_LARGE_PAYLOAD, _sign(_LARGE_PAYLOAD), _SECRET, True, id="large"),
+]
 
-    def test_empty_payload(self):
-        payload = b""
-        sig = self._sign(payload)
-        assert verify_signature(payload, sig, self.SECRET) is True
 
-    def test_large_payload(self):
-        payload = b"x" * 100_000
-        sig = self._sign(payload)
-        assert verify_signature(payload, sig, self.SECRET) is True
+class TestVerifySignature:
+    @pytest.mark.parametrize(("payload", "signature", "secret", "expected"), _SIGNATURE_CASES)
+    def test_verify(self, payload, signature, secret, expected):
+        assert verify_signature(payload, signature, secret) is expected
 
 
 # ── Webhook Event Parsing ───────────────────────────────────────────────────
@@ -83,9 +71,20 @@ def _build_pr_payload(action: str = "opened", pr_number: int = 42) -> dict:
     }
 
 
+# Shared by the event tests, which only read it; each case overrides "action"
+# in a shallow copy, so the nested dicts are shared too
+_BASE_PR = MappingProxyType(_build_pr_payload())
+
+_EXPECTED_ACTIONABLE_EVENTS = frozenset({
+    ("pull_request", "opened"),
+    ("pull_request", "synchronize"),
+    ("pull_request", "reopened"),
+})
+
+
 class TestParseWebhookEvent:
-    def test_pr_opened(self):
-        event = parse_webhook_event("pull_request", _build_pr_payload("opened"))
+    def test_pr_fields_extracted(self):
+        event = parse_webhook_event("pull_request", dict(_BASE_PR))
         assert event is not None
         assert event.action == "opened"
         assert event.repo_owner == "testorg"
@@ -93,23 +92,23 @@ class TestParseWebhookEvent:
         assert event.pr_number == 42
         assert event.sender == "testuser"
 
-    def test_pr_synchronize(self):
-        event = parse_webhook_event("pull_request", _build_pr_payload("synchronize"))
-        assert event is not None
-        assert event.action == "synchronize"
-
-    def test_pr_reopened(self):
-        event = parse_webhook_event("pull_request", _build_pr_payload("reopened"))
-        assert event is not None
-        assert event.action == "reopened"
-
-    def test_pr_closed_ignored(self):
-        event = parse_webhook_event("pull_request", _build_pr_payload("closed"))
-        assert event is None
-
-    def test_pr_edited_ignored(self):
-        event = parse_webhook_event("pull_request", _build_pr_payload("edited"))
-        assert event is None
+    @pytest.mark.parametrize(
+        ("action", "actionable"),
+        [
+            ("opened", True),
+            ("synchronize", True),
+            ("reopened", True),
+            ("closed", False),
+            ("edited", False),
+        ],
+    )
+    def test_pr_actions(self, action, actionable):
+        event = parse_webhook_event("pull_request", {**_BASE_PR, "action": action})
+        if actionable:
+            assert event is not None
+            assert event.action == action
+        else:
+            assert event is None
 
     def test_non_pr_event_ignored(self):
         payload = {"action": "created", "issue": {"number": 1}}
@@ -131,7 +130,4 @@ class TestParseWebhookEvent:
 
     def test_actionable_events_set(self):
         """Ensure all expected event types are registered."""
-        assert ("pull_request", "opened") in ACTIONABLE_EVENTS
-        assert ("pull_request", "synchronize") in ACTIONABLE_EVENTS
-        assert ("pull_request", "reopened") in ACTIONABLE_EVENTS
-        assert len(ACTIONABLE_EVENTS) == 3
+        assert ACTIONABLE_EVENTS == _EXPECTED_ACTIONABLE_EVENTS